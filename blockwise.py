@@ -0,0 +1,203 @@
+"""
+Analysis of games too large to hold as lists of strategies.
+
+The payoffs are kept in binary files of float64 values, one row after the other,
+and are memory mapped. Both files use the layout of payoff_matrices of a game:
+the file of the player holds player_payoffs[p][o], the file of the opponent
+opponent_payoffs[o][p]. The rows are streamed in blocks of a bounded number of
+entries, and only the running maxima, the strategies reaching them and the pairs
+of strategies still in question are kept in memory.
+"""
+
+import mmap
+from array import array
+from itertools import compress
+from math import fsum
+from operator import ge, le, lt
+from typing import Iterable, Iterator, NamedTuple
+
+# the number of payoffs converted to floats at once
+BLOCK_SIZE = 1 << 20
+
+
+class PayoffMatrix:
+    """
+    a read only matrix of float64 payoffs mapped from a file
+    """
+
+    def __init__(self, path: str, columns: int):
+        """
+        :param columns: the length of a row, the number of rows follows from the size
+            of the file
+        :raise: ValueError when the size of the file does not fit the columns
+        """
+        if columns < 1:
+            raise ValueError("A matrix needs at least one column")
+        self.path = path
+        self.columns = columns
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            if size == 0 or size % (8 * columns) != 0:
+                raise ValueError(f"{path} does not hold rows of {columns} payoffs")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._values = memoryview(self._map).cast("d")
+        self.rows = len(self._values) // columns
+
+    def __enter__(self) -> "PayoffMatrix":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # the view has to be released before the map can be closed
+        self._values.release()
+        self._map.close()
+
+    def row(self, index: int) -> list[float]:
+        start = index * self.columns
+        return self._values[start : start + self.columns].tolist()
+
+    def blocks(self, block_size: int = BLOCK_SIZE) -> Iterator[tuple[int, list[list[float]]]]:
+        """
+        yields the rows in blocks of about block_size payoffs, with the index of the
+        first row of each block
+        """
+        step = max(1, block_size // self.columns)
+        for start in range(0, self.rows, step):
+            stop = min(start + step, self.rows)
+            values = self._values[start * self.columns : stop * self.columns].tolist()
+            yield start, [
+                values[k : k + self.columns] for k in range(0, len(values), self.columns)
+            ]
+
+    def tile(self, rows: Iterable[int], start: int, stop: int) -> dict[int, list[float]]:
+        """
+        returns the payoffs of the given rows in the columns from start to stop
+        """
+        n = self.columns
+        return {r: self._values[r * n + start : r * n + stop].tolist() for r in rows}
+
+
+def write_matrix(path: str, rows: Iterable[Iterable[float]]) -> int:
+    """
+    writes the rows as float64 values, the rows can be generated one by one so the
+    matrix never has to be held in memory
+
+    :return: the number of rows written
+    """
+    count = 0
+    with open(path, "wb") as file:
+        for row in rows:
+            array("d", row).tofile(file)
+            count += 1
+    return count
+
+
+class BestResponses(NamedTuple):
+    """
+    values[o] is the best payoff against the strategy o of the other player and
+    strategies[o] the strategies reaching it
+    """
+
+    values: list[float]
+    strategies: list[list[int]]
+
+
+def best_responses(matrix: PayoffMatrix, block_size: int = BLOCK_SIZE) -> BestResponses:
+    """
+    the best responses of the player owning the rows against every strategy of the
+    other player, in a single pass over the file
+    """
+    values = [float("-inf")] * matrix.columns
+    strategies: list[list[int]] = [[] for _ in range(matrix.columns)]
+
+    columns = range(matrix.columns)
+    for start, block in matrix.blocks(block_size):
+        for r, row in enumerate(block, start):
+            # only the columns where the row reaches the running maximum are looked at
+            for o in compress(columns, map(ge, row, values)):
+                payoff = row[o]
+                if payoff > values[o]:
+                    values[o] = payoff
+                    strategies[o] = [r]
+                else:
+                    strategies[o].append(r)
+
+    return BestResponses(values, strategies)
+
+
+def pure_nash_equilibria(
+    player: PayoffMatrix, opponent: PayoffMatrix, block_size: int = BLOCK_SIZE
+) -> list[tuple[int, int]]:
+    """
+    the pure Nash equilibria as pairs (player strategy, opponent strategy), ordered
+    by the strategy of the player
+    """
+    if player.rows != opponent.columns or player.columns != opponent.rows:
+        raise ValueError("The payoffs of the player and the opponent do not match")
+
+    player_best = best_responses(player, block_size).strategies
+    opponent_best = best_responses(opponent, block_size).strategies
+
+    equilibria = [
+        (p, o) for o, rows in enumerate(player_best) for p in rows if o in opponent_best[p]
+    ]
+    return sorted(equilibria)
+
+
+def dominated_strategies(
+    matrix: PayoffMatrix,
+    weakly: bool = False,
+    block_rows: int = 256,
+    block_columns: int = 4096,
+) -> list[int]:
+    """
+    the strategies of the player owning the rows which are dominated by another one,
+    with the same meaning as DefaultPlayer.strictly_dominated_strategy and
+    DefaultPlayer.weakly_dominated_strategy
+
+    The rows are compared block against block, tile by tile, dropping a pair as soon
+    as a tile contradicts the dominance. As a row can only be dominated by a row with
+    at least its sum, the sums are computed first to skip most pairs.
+
+    :param block_rows: the number of rows per block, so at most block_rows squared
+        pairs are in question at once
+    :param block_columns: the number of columns of the widest tile
+    """
+    compare = le if weakly else lt
+    sums = list()
+    for _, block in matrix.blocks():
+        sums.extend(fsum(row) for row in block)
+
+    dominated = [False] * matrix.rows
+    starts = range(0, matrix.rows, block_rows)
+    for first in starts:
+        under_test = range(first, min(first + block_rows, matrix.rows))
+        for second in starts:
+            candidates = range(second, min(second + block_rows, matrix.rows))
+            pairs = [
+                (i, k)
+                for i in under_test
+                if not dominated[i]
+                for k in candidates
+                if k != i and sums[k] >= sums[i]
+            ]
+            # most pairs are decided by the first few columns, so the tiles start
+            # narrow and grow up to block_columns
+            start = 0
+            width = min(16, block_columns)
+            while pairs and start < matrix.columns:
+                stop = min(start + width, matrix.columns)
+                tile = matrix.tile({r for pair in pairs for r in pair}, start, stop)
+                pairs = [
+                    (i, k)
+                    for i, k in pairs
+                    if not dominated[i] and all(map(compare, tile[i], tile[k]))
+                ]
+                start = stop
+                width = min(2 * width, block_columns)
+            for i, _ in pairs:
+                dominated[i] = True
+
+    return [i for i, flag in enumerate(dominated) if flag]
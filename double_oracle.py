@@ -0,0 +1,162 @@
+"""
+The double oracle method for large two player zero-sum games.
+
+Instead of the whole matrix, only a small restricted game is solved exactly.
+Each player then computes a best response against the equilibrium of the
+restricted game within the full game, and the best responses are added to the
+restricted strategy sets. Once neither best response improves on the value of
+the restricted game, its equilibrium is one of the full game. See McMahan,
+Gordon and Blum (2003).
+
+The payoffs are only ever asked for the restricted strategies and the supports
+of the equilibria, so they can be given as a callable instead of a matrix.
+"""
+
+from typing import Callable, NamedTuple, Optional, Sequence, Union
+
+from lp import linprog
+
+Payoffs = Union[Sequence[Sequence[float]], Callable[[int, int], float]]
+
+
+class ZeroSumSolution(NamedTuple):
+    """
+    the equilibrium of a zero-sum game, the value is the expected payoff of the
+    player choosing the row, and the mixes cover all strategies of a player
+    """
+
+    value: float
+    player: list[float]
+    opponent: list[float]
+    player_support: list[int]
+    opponent_support: list[int]
+    iterations: int
+
+
+def double_oracle(
+    payoffs: Payoffs,
+    rows: Optional[int] = None,
+    columns: Optional[int] = None,
+    initial: tuple[int, int] = (0, 0),
+    tol: float = 1e-9,
+    max_iterations: int = 10000,
+) -> ZeroSumSolution:
+    """
+    solves the zero-sum game where the player choosing the row maximises the payoff
+    and the opponent choosing the column minimises it
+
+    :param payoffs: either the matrix of payoffs, or a callable payoff(row, column)
+    :param rows: the number of strategies of the player, only needed for a callable
+    :param columns: the number of strategies of the opponent, only needed for a callable
+    :param initial: the pair of strategies the restricted game starts with
+    :param tol: the gap between the best responses at which the solution is accepted
+    :raise: ValueError when the sizes are missing or the method does not converge
+    :return: the equilibrium found
+    :rtype: ZeroSumSolution
+    """
+    if callable(payoffs):
+        if rows is None or columns is None:
+            raise ValueError("The number of rows and columns are needed for a callable")
+        payoff = payoffs
+    else:
+        matrix = payoffs
+        rows = len(matrix)
+        columns = len(matrix[0]) if rows else 0
+        payoff = lambda r, c: matrix[r][c]
+    if rows == 0 or columns == 0:
+        raise ValueError("Both players need at least one strategy")
+
+    restricted_rows = [initial[0]]
+    restricted_columns = [initial[1]]
+    # the restricted matrix, grown by a row or a column at a time
+    restricted = [[float(payoff(initial[0], initial[1]))]]
+    basis = None
+    # the shift to positive payoffs only changes with a new minimum, so the basis
+    # of the previous restricted game stays feasible when just a column was added
+    shift = 1.0 - restricted[0][0]
+
+    for iteration in range(1, max_iterations + 1):
+        shift = max(shift, 1.0 - min(min(row) for row in restricted))
+        value, x, y, basis = _solve_restricted(restricted, shift, basis)
+
+        player_support = [(restricted_rows[k], p) for k, p in enumerate(x) if p > 0]
+        opponent_support = [(restricted_columns[k], q) for k, q in enumerate(y) if q > 0]
+
+        # the best responses within the full game
+        best_row, upper = _best_response(
+            rows, lambda r: sum(q * payoff(r, c) for c, q in opponent_support), max
+        )
+        best_column, lower = _best_response(
+            columns, lambda c: sum(p * payoff(r, c) for r, p in player_support), min
+        )
+
+        grown = False
+        added_column = False
+        if upper > value + tol and best_row not in restricted_rows:
+            restricted_rows.append(best_row)
+            restricted.append([float(payoff(best_row, c)) for c in restricted_columns])
+            grown = True
+        if lower < value - tol and best_column not in restricted_columns:
+            restricted_columns.append(best_column)
+            for r, row in zip(restricted_rows, restricted):
+                row.append(float(payoff(r, best_column)))
+            grown = added_column = True
+
+        if not grown:
+            player = [0.0] * rows
+            for r, p in player_support:
+                player[r] = p
+            opponent = [0.0] * columns
+            for c, q in opponent_support:
+                opponent[c] = q
+            return ZeroSumSolution(
+                value,
+                player,
+                opponent,
+                sorted(r for r, _ in player_support),
+                sorted(c for c, _ in opponent_support),
+                iteration,
+            )
+
+        basis = _grow_basis(basis, len(restricted_columns), added_column)
+
+    raise ValueError("Double oracle did not converge")
+
+
+def _best_response(size: int, expected: Callable[[int], float], better) -> tuple[int, float]:
+    best = better(range(size), key=expected)
+    return best, expected(best)
+
+
+def _solve_restricted(
+    matrix: list[list[float]], shift: float, basis: Optional[list[int]]
+) -> tuple[float, list[float], list[float], list[int]]:
+    """
+    solves the restricted game with the linear program of the opponent
+
+        maximise sum(w)  subject to  M w <= 1, w >= 0
+
+    where M is the matrix shifted to positive payoffs. The value is 1 / sum(w), the
+    mix of the opponent w * value, and the one of the player the duals times value.
+    """
+    columns = len(matrix[0])
+    rows_ub = [[a + shift for a in row] for row in matrix]
+    result = linprog([1.0] * columns, rows_ub, [1.0] * len(matrix), basis=basis)
+
+    total = sum(result.x)
+    value = 1.0 / total
+    y = [w * value for w in result.x]
+    x = [max(d, 0.0) * value for d in result.duals]
+    # the duals sum up to the objective, small deviations are rounding
+    x_total = sum(x)
+    x = [p / x_total for p in x]
+    return value - shift, x, y, result.basis
+
+
+def _grow_basis(basis: list[int], columns: int, grew_column: bool) -> list[int]:
+    """
+    renumbers the basis of the previous restricted game, whose slacks follow the
+    variables of the columns, for the grown game
+    """
+    previous = columns - 1 if grew_column else columns
+    return [j if j < previous else j + columns - previous for j in basis]
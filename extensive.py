@@ -0,0 +1,481 @@
+"""
+Extensive form games, hence games played as a tree of moves.
+
+Games of perfect information are solved by backward induction, where every node
+is only solved once, even if it is reached along several paths of the tree.
+
+Games of imperfect information are turned into their sequence form (Koller,
+Megiddo and von Stengel 1996): a strategy is described by the probabilities of
+the sequences of own moves, rather than by a pure strategy for every combination
+of information sets. So the game stays linear in the size of the tree instead of
+growing exponentially as the normal form does. Zero-sum games in sequence form
+are solved by a linear program.
+
+A tree is read from an *.ini file with a section per node, starting at [root]:
+
+    [names]
+    player = P
+    opponent = O
+
+    [root]
+    player = P
+    actions = In: entered, Out: stayed_out
+
+    [entered]
+    player = O
+    infoset = O1
+    actions = Fight: fight, Accommodate: share
+
+    [fight]
+    payoffs = -1, -1
+
+Nodes of the same information set share the infoset name, chance nodes use
+player = chance and give the probability after each action, e.g. "Heads: h (0.5)".
+"""
+
+import argparse
+import configparser
+import os
+from math import isclose
+from sys import exit
+from typing import NamedTuple, Optional, Union
+
+from lp import linprog
+
+CHANCE = "chance"
+
+
+class Terminal:
+    """
+    a leaf of the tree holding the payoffs of the player and the opponent
+    """
+
+    def __init__(self, name: str, payoffs: tuple[float, float]):
+        self.name = name
+        self.payoffs = payoffs
+
+
+class Decision:
+    """
+    a node where the player (0) or the opponent (1) chooses an action
+    """
+
+    def __init__(self, name: str, player: int, infoset: str, actions: dict[str, "Node"]):
+        self.name = name
+        self.player = player
+        self.infoset = infoset
+        self.actions = actions
+
+
+class Chance:
+    """
+    a node where nature chooses an action with the given probabilities
+    """
+
+    def __init__(self, name: str, actions: dict[str, tuple[float, "Node"]]):
+        self.name = name
+        self.actions = actions
+
+
+Node = Union[Terminal, Decision, Chance]
+
+
+class Solution(NamedTuple):
+    """
+    the result of backward induction: the payoffs and the chosen action per node
+    """
+
+    payoffs: tuple[float, float]
+    actions: dict[str, str]
+
+
+class SequenceForm(NamedTuple):
+    """
+    the sequence form of a two player game
+
+    sequences[i] lists the sequences of player i as (infoset, action), starting with
+    the empty sequence None. The realisation plans x and y satisfy E x = e and F y = f,
+    where the constraint rows are given sparse. payoffs[i] maps a pair of sequence
+    indices to the expected payoff of player i at the leaves reached by them.
+    """
+
+    sequences: tuple[list, list]
+    constraints: tuple[list[dict[int, float]], list[dict[int, float]]]
+    payoffs: tuple[dict[tuple[int, int], float], dict[tuple[int, int], float]]
+
+
+class ExtensiveGame:
+    """
+    a two player game in extensive form
+    """
+
+    def __init__(self, root: Node, names: tuple[str, str] = ("P", "O")):
+        self._root = root
+        self._names = names
+
+    @property
+    def root(self) -> Node:
+        return self._root
+
+    @property
+    def names(self) -> tuple[str, str]:
+        return self._names
+
+    def nodes(self) -> list[Node]:
+        """
+        returns every node of the tree once, in depth first order
+        """
+        seen: set[int] = set()
+        nodes: list[Node] = list()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            nodes.append(node)
+            stack.extend(reversed(_children(node)))
+        return nodes
+
+    def is_perfect_information(self) -> bool:
+        """
+        a game has perfect information if no information set holds more than one node
+        """
+        infosets: set[tuple[int, str]] = set()
+        for node in self.nodes():
+            if isinstance(node, Decision):
+                if (node.player, node.infoset) in infosets:
+                    return False
+                infosets.add((node.player, node.infoset))
+        return True
+
+    def backward_induction(self) -> Solution:
+        """
+        solves a game of perfect information from the leaves up to the root, every
+        node reached along several paths is only solved once
+
+        :raise: ValueError when the game has imperfect information
+        :return: the payoffs of the subgame perfect equilibrium and the actions
+            chosen at every decision node
+        :rtype: Solution
+        """
+        if not self.is_perfect_information():
+            raise ValueError("Backward induction needs a game of perfect information")
+
+        memo: dict[int, tuple[float, float]] = {}
+        actions: dict[str, str] = {}
+
+        def solve(node: Node) -> tuple[float, float]:
+            if id(node) in memo:
+                return memo[id(node)]
+            if isinstance(node, Terminal):
+                value = node.payoffs
+            elif isinstance(node, Chance):
+                outcomes = [(p, solve(child)) for p, child in node.actions.values()]
+                value = (
+                    sum(p * v[0] for p, v in outcomes),
+                    sum(p * v[1] for p, v in outcomes),
+                )
+            else:
+                best_action = None
+                value = None
+                for action, child in node.actions.items():
+                    payoffs = solve(child)
+                    if value is None or payoffs[node.player] > value[node.player]:
+                        best_action = action
+                        value = payoffs
+                actions[node.name] = best_action
+            memo[id(node)] = value
+            return value
+
+        return Solution(solve(self._root), actions)
+
+    def sequence_form(self) -> SequenceForm:
+        """
+        builds the sequence form by a single walk through the tree
+
+        :raise: ValueError when a player forgets his/her own moves (no perfect recall),
+            or the nodes of an information set do not offer the same actions
+        """
+        sequences: tuple[list, list] = ([None], [None])
+        index: tuple[dict, dict] = ({None: 0}, {None: 0})
+        # the sequence leading to each information set, which is unique with perfect recall
+        parents: tuple[dict, dict] = ({}, {})
+        # the actions of each information set, the same at all of its nodes
+        actions: tuple[dict, dict] = ({}, {})
+        payoffs: tuple[dict, dict] = ({}, {})
+
+        def walk(node: Node, history: tuple, probability: float) -> None:
+            if isinstance(node, Terminal):
+                key = (index[0][history[0]], index[1][history[1]])
+                for i in range(2):
+                    payoffs[i][key] = payoffs[i].get(key, 0.0) + probability * node.payoffs[i]
+            elif isinstance(node, Chance):
+                for p, child in node.actions.values():
+                    walk(child, history, probability * p)
+            else:
+                i = node.player
+                parent = parents[i].setdefault(node.infoset, history[i])
+                if parent != history[i]:
+                    raise ValueError(f"Information set {node.infoset} violates perfect recall")
+                if actions[i].setdefault(node.infoset, set(node.actions)) != set(node.actions):
+                    raise ValueError(
+                        f"The nodes of information set {node.infoset} offer different actions"
+                    )
+                for action, child in node.actions.items():
+                    sequence = (node.infoset, action)
+                    if sequence not in index[i]:
+                        index[i][sequence] = len(sequences[i])
+                        sequences[i].append(sequence)
+                    next_history = list(history)
+                    next_history[i] = sequence
+                    walk(child, tuple(next_history), probability)
+
+        walk(self._root, (None, None), 1.0)
+
+        # the empty sequence is played with probability 1, and the probability of a
+        # sequence is split amongst its extensions at every information set
+        constraints: tuple[list, list] = ([{0: 1.0}], [{0: 1.0}])
+        for i in range(2):
+            infosets: dict[str, dict[int, float]] = {}
+            for s, sequence in enumerate(sequences[i]):
+                if sequence is not None:
+                    infoset = sequence[0]
+                    row = infosets.setdefault(
+                        infoset, {index[i][parents[i][infoset]]: -1.0}
+                    )
+                    row[s] = 1.0
+            constraints[i].extend(infosets.values())
+
+        return SequenceForm(sequences, constraints, payoffs)
+
+    def is_zero_sum(self) -> bool:
+        """
+        a game is zero-sum if the payoffs of the opponent are the negated ones of the
+        player at every leaf
+        """
+        return all(
+            node.payoffs[0] == -node.payoffs[1]
+            for node in self.nodes()
+            if isinstance(node, Terminal)
+        )
+
+    def solve_zero_sum(self) -> tuple[float, dict[str, dict[str, float]], dict[str, dict[str, float]]]:
+        """
+        solves a zero-sum game of imperfect information by the linear program of its
+        sequence form, the payoffs of the player are the ones used
+
+        :raise: ValueError when the game is not zero-sum
+
+        :return: the value of the game for the player, and the behaviour strategies of
+            the player and the opponent as probabilities of the actions per information set
+        """
+        if not self.is_zero_sum():
+            raise ValueError("The game is not zero-sum")
+        form = self.sequence_form()
+        n = [len(form.sequences[0]), len(form.sequences[1])]
+        a = form.payoffs[0]
+
+        # the player maximises f * q subject to F^T q <= A^T x, E x = e, x >= 0
+        # with q free, split into q+ and q-
+        value, x = _solve_side(a, form.constraints[0], form.constraints[1], n[0], n[1], False)
+        # the opponent minimises e * p subject to E^T p >= A y, F y = f, y >= 0
+        _, y = _solve_side(a, form.constraints[1], form.constraints[0], n[1], n[0], True)
+
+        return (
+            value,
+            _behaviour(form.sequences[0], x),
+            _behaviour(form.sequences[1], y),
+        )
+
+
+def _solve_side(
+    payoffs: dict[tuple[int, int], float],
+    own_constraints: list[dict[int, float]],
+    other_constraints: list[dict[int, float]],
+    own_size: int,
+    other_size: int,
+    minimising: bool,
+) -> tuple[float, list[float]]:
+    """
+    the sequence form linear program of one side, variables are the realisation plan
+    followed by the split dual variables of the constraints of the other side
+    """
+    duals = len(other_constraints)
+    # a column of the other side for each of its sequences
+    rows: list[dict[int, float]] = [dict() for _ in range(other_size)]
+    for (s0, s1), u in payoffs.items():
+        own, other = (s1, s0) if minimising else (s0, s1)
+        if u != 0:
+            # maximising: sum_h F[h][s] q_h - sum_i A[i][s] x_i <= 0
+            # minimising: sum_j A[s][j] y_j - sum_h E[h][s] p_h <= 0
+            sign = 1.0 if minimising else -1.0
+            rows[other][own] = rows[other].get(own, 0.0) + sign * u
+    for h, constraint in enumerate(other_constraints):
+        for s, coefficient in constraint.items():
+            sign = -1.0 if minimising else 1.0
+            rows[s][own_size + h] = rows[s].get(own_size + h, 0.0) + sign * coefficient
+            rows[s][own_size + duals + h] = (
+                rows[s].get(own_size + duals + h, 0.0) - sign * coefficient
+            )
+
+    # the right hand side of the other sides constraints is 1 for the empty sequence
+    c = [0.0] * (own_size + 2 * duals)
+    c[own_size] = -1.0 if minimising else 1.0
+    c[own_size + duals] = 1.0 if minimising else -1.0
+
+    equalities = [dict(row) for row in own_constraints]
+    b_eq = [1.0] + [0.0] * (len(own_constraints) - 1)
+
+    result = linprog(c, rows, [0.0] * len(rows), equalities, b_eq)
+    value = -result.value if minimising else result.value
+    return value, result.x[:own_size]
+
+
+def _behaviour(sequences: list, plan: list[float]) -> dict[str, dict[str, float]]:
+    """
+    turns a realisation plan into the probabilities of the actions per information set
+    """
+    probability = dict(zip(sequences, plan))
+    totals: dict[str, float] = {}
+    for sequence, p in probability.items():
+        if sequence is not None:
+            totals[sequence[0]] = totals.get(sequence[0], 0.0) + p
+
+    behaviour: dict[str, dict[str, float]] = {}
+    for sequence, p in probability.items():
+        if sequence is not None:
+            infoset, action = sequence
+            total = totals[infoset]
+            behaviour.setdefault(infoset, {})[action] = p / total if total > 1e-12 else 0.0
+    # information sets never reached are played uniformly
+    for infoset, actions in behaviour.items():
+        if totals[infoset] <= 1e-12:
+            for action in actions:
+                actions[action] = 1 / len(actions)
+    return behaviour
+
+
+def _children(node: Node) -> list[Node]:
+    if isinstance(node, Terminal):
+        return []
+    if isinstance(node, Chance):
+        return [child for _, child in node.actions.values()]
+    return list(node.actions.values())
+
+
+def game_from_config(config: configparser.ConfigParser) -> ExtensiveGame:
+    """
+    builds the tree from the sections of an already read configuration, a section
+    referred to by several nodes becomes a single shared node
+    """
+    names = (
+        config.get("names", "player", fallback="P"),
+        config.get("names", "opponent", fallback="O"),
+    )
+    nodes: dict[str, Node] = {}
+    building: set[str] = set()
+
+    def build(name: str) -> Node:
+        if name in nodes:
+            return nodes[name]
+        if not config.has_section(name):
+            raise ValueError(f"Node {name} is not defined")
+        if name in building:
+            raise ValueError(f"Node {name} is part of a cycle")
+        building.add(name)
+        section = config[name]
+
+        if "payoffs" in section:
+            payoffs = [float(p) for p in section["payoffs"].split(",")]
+            if len(payoffs) != 2:
+                raise ValueError(f"Terminal {name} needs two payoffs")
+            node: Node = Terminal(name, (payoffs[0], payoffs[1]))
+        else:
+            actions = _parse_actions(name, section.get("actions", ""))
+            mover = section.get("player", "")
+            if mover == CHANCE:
+                if any(p is None for p, _ in actions.values()):
+                    raise ValueError(f"Chance node {name} needs a probability per action")
+                if any(p < 0 for p, _ in actions.values()) or not isclose(
+                    sum(p for p, _ in actions.values()), 1.0
+                ):
+                    raise ValueError(f"The probabilities of chance node {name} do not sum up to 1")
+                node = Chance(name, {a: (p, build(child)) for a, (p, child) in actions.items()})
+            elif mover in names:
+                node = Decision(
+                    name,
+                    names.index(mover),
+                    section.get("infoset", name),
+                    {a: build(child) for a, (_, child) in actions.items()},
+                )
+            else:
+                raise ValueError(f"Node {name} is played by unknown player {mover}")
+
+        building.discard(name)
+        nodes[name] = node
+        return node
+
+    return ExtensiveGame(build("root"), names)
+
+
+def _parse_actions(name: str, actions_str: str) -> dict[str, tuple[Optional[float], str]]:
+    """
+    parses "A: node, B: other (0.5)" into the child and the probability per action
+    """
+    actions: dict[str, tuple[Optional[float], str]] = {}
+    try:
+        for entry in actions_str.split(","):
+            action, child = entry.split(":")
+            child = child.strip()
+            probability = None
+            if child.endswith(")"):
+                child, probability_str = child[:-1].split("(")
+                child = child.strip()
+                probability = float(probability_str)
+            actions[action.strip()] = (probability, child)
+    except ValueError:
+        raise ValueError(f"Error while parsing actions for {name}: {actions_str}")
+    if len(actions) == 0:
+        raise ValueError(f"Node {name} has no actions")
+    return actions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve extensive form games")
+    parser.add_argument(
+        "-c",
+        type=str,
+        required=True,
+        help="path to the *.ini file holding the tree, should be located in a folder called games",
+    )
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    if len(config.read(os.path.join(".", args.c))) != 1:
+        exit(f"{args.c} could not be found")
+    try:
+        game = game_from_config(config)
+    except ValueError as ve:
+        exit(ve)
+
+    if game.is_perfect_information():
+        print("Solving by backward induction ...")
+        solution = game.backward_induction()
+        for node, action in solution.actions.items():
+            print(f"   at {node} play {action}")
+        print(f"Payoffs: {solution.payoffs}")
+    elif not game.is_zero_sum():
+        exit("Games of imperfect information can only be solved if they are zero-sum")
+    else:
+        print("Solving the sequence form as zero-sum game ...")
+        value, player, opponent = game.solve_zero_sum()
+        for name, behaviour in zip(game.names, (player, opponent)):
+            for infoset, actions in behaviour.items():
+                for action, p in actions.items():
+                    print(f"   {name} should play {action} at {infoset} with {p:.0%}")
+        print(f"Value of the game for {game.names[0]}: {value:.4g}")
+
+
+if __name__ == "__main__":
+    main()
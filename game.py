@@ -1,5 +1,14 @@
-from tabulate import tabulate  # table pretty
-from typing import Optional  # annotation
+from typing import Callable, NamedTuple, Optional, TextIO  # annotation
+from math import isclose
+from io import StringIO
+from itertools import combinations
+from operator import mul
+import sys
+
+from linalg import solve
+from lp import LPResult, linprog
+from qre import QREPoint, logit_qre_path
+from render import payoff_cell, write_summary, write_table
 
 
 class Strategy:
@@ -7,6 +16,8 @@ class Strategy:
     a strategy has a name and some payoffs in form of a list
     """
 
+    __slots__ = ("_name", "_payoffs")
+
     def __init__(self, name: str, payoffs: list[int]):
         """
         initialise a new strategy by providing a name and the list of payoffs
@@ -49,6 +60,8 @@ class DefaultPlayer:
     a player has a name and a set of strategies
     """
 
+    __slots__ = ("_name", "_strategy_set")
+
     def __init__(self, name: str, payoffs_str: str):
         """
         initialises a new player with the specified name and payoffs
@@ -237,41 +250,245 @@ class DefaultPlayer:
 
 
 class Player(DefaultPlayer):
+    __slots__ = ()
+
     def __init__(self, name, payoffs):
         super().__init__(name, payoffs)
 
 
 class Opponent(DefaultPlayer):
+    __slots__ = ()
+
     def __init__(self, name, payoffs):
         super().__init__(name, payoffs)
 
 
+class BestResponse:
+    """
+    an index over the payoffs of a game to answer best response queries
+
+    for every strategy of the opponent the strategies of the player are kept in an
+    order sorted by payoff (and vice versa), so the best responses to a pure strategy
+    are simply the head of that order. The game keeps the index up to date when a
+    strategy is removed, so it does not need to be rebuilt.
+    """
+
+    def __init__(self, game: "Game"):
+        """
+        builds the orders and the best responses for both players of the game
+        """
+        self._players = game.players
+        # _orders[0][o] holds the players strategies sorted by payoff against the
+        # opponents strategy o, _orders[1][p] the other way round
+        self._orders: list[list[list[int]]] = [[], []]
+        self._best: list[list[list[int]]] = [[], []]
+
+        for side in range(2):
+            strategy_set = self._players[side].strategy_set
+            other_size = self._players[1 - side].strategy_set_size()
+            for k in range(other_size):
+                order = sorted(
+                    range(len(strategy_set)),
+                    key=lambda s: strategy_set[s].payoff(k),
+                    reverse=True,
+                )
+                self._orders[side].append(order)
+                self._best[side].append(self._head(side, k))
+
+    def _payoff(self, side: int, strategy_index: int, other_index: int) -> float:
+        return self._players[side].strategy(strategy_index).payoff(other_index)
+
+    def _head(self, side: int, other_index: int) -> list[int]:
+        """
+        returns all strategies at the head of the order sharing the biggest payoff
+        """
+        order = self._orders[side][other_index]
+        if len(order) == 0:
+            return []
+        best = self._payoff(side, order[0], other_index)
+        head = list()
+        for s in order:
+            if self._payoff(side, s, other_index) != best:
+                break
+            head.append(s)
+        return head
+
+    def _side(self, player: DefaultPlayer) -> int:
+        return self._players.index(player)
+
+    def ranking(self, player: DefaultPlayer, other_index: int) -> list[int]:
+        """
+        returns the indices of the strategies of the player ordered from best to
+        worst payoff, given the other player plays the strategy at other_index
+        """
+        return list(self._orders[self._side(player)][other_index])
+
+    def best_responses(self, player: DefaultPlayer, against) -> list[int]:
+        """
+        returns the indices of the best responses of the player
+
+        :param player: the player of the game that is responding
+        :param against: either the index of a pure strategy of the other player, or
+            a mixed strategy given as a sequence of probabilities over the other
+            players strategy set
+        :return: the indices of all strategies sharing the biggest (expected) payoff
+        :rtype: list[int]
+        """
+        side = self._side(player)
+        if isinstance(against, int):
+            return list(self._best[side][against])
+
+        strategy_set = self._players[side].strategy_set
+        if len(against) != self._players[1 - side].strategy_set_size():
+            raise ValueError("Mixed strategy must cover the other players strategy set")
+
+        expected = [
+            sum(q * strategy.payoff(k) for k, q in enumerate(against) if q != 0)
+            for strategy in strategy_set
+        ]
+        if len(expected) == 0:
+            return []
+        best = max(expected)
+        return [
+            s
+            for s in range(len(expected))
+            if isclose(expected[s], best, rel_tol=1e-9, abs_tol=1e-12)
+        ]
+
+    def unique_best_responses(self, player: DefaultPlayer) -> set[int]:
+        """
+        returns the indices of the strategies of the player which are the only best
+        response to some strategy of the other player, such a strategy can neither be
+        strictly nor weakly dominated
+        """
+        return {best[0] for best in self._best[self._side(player)] if len(best) == 1}
+
+    def remove(self, side: int, strategy_index: int) -> None:
+        """
+        updates the index after the strategy at strategy_index of the player at
+        position side within the game has been removed
+        """
+        # the removed strategy no longer shows up in the orders of its own player
+        for k, order in enumerate(self._orders[side]):
+            self._orders[side][k] = [
+                s if s < strategy_index else s - 1 for s in order if s != strategy_index
+            ]
+            self._best[side][k] = self._head(side, k)
+
+        # and the other player no longer needs to respond to it
+        self._orders[1 - side].pop(strategy_index)
+        self._best[1 - side].pop(strategy_index)
+
+
 class Game:
     def __init__(self, player: Player, opponent: Player):
         self._player = player
         self._opponent = opponent
         self._players = [self._player, self._opponent]
+        self._best_response: Optional[BestResponse] = None
 
     def __str__(self):
-        player = self._players[0]
-        opponent = self._players[1]
-
-        header = []
-        for strategy in opponent.strategy_set:
-            header.append(strategy.name)
-
-        data = []
-        for p in range(len(player.strategy_set)):
-            strategy_p = player.strategy(p)
-            tpp = []
-            tpp.append(strategy_p.name)
-            for o in range(len(opponent.strategy_set)):
-                strategy_o = opponent.strategy(o)
-                tp = f"({strategy_p.payoff(o)} | {strategy_o.payoff(p)})"
-                tpp.append(tp)
-            data.append(tpp)
-
-        return tabulate(data, header, tablefmt="grid", stralign="center")
+        """
+        returns the payoff matrix as grid, large games are truncated to a summary
+        """
+        stream = StringIO()
+        self.write(stream, fmt="summary")
+        return stream.getvalue().rstrip("\n")
+
+    def write(
+        self,
+        stream: TextIO,
+        fmt: str = "grid",
+        chunk_size: int = 256,
+        max_rows: int = 20,
+        max_columns: int = 10,
+    ) -> None:
+        """
+        writes the payoff matrix to the stream without building it in memory first
+
+        :param fmt: grid, csv or html for the complete matrix, or summary for a grid
+            truncated to max_rows and max_columns
+        :param chunk_size: the number of rows written at once
+        """
+        player = self._player
+        opponent = self._opponent
+        self._write_cells(
+            stream,
+            lambda p, o: payoff_cell(player, opponent, p, o),
+            fmt,
+            chunk_size,
+            max_rows,
+            max_columns,
+        )
+
+    def write_best_responses(
+        self,
+        stream: TextIO,
+        fmt: str = "grid",
+        chunk_size: int = 256,
+        max_rows: int = 20,
+        max_columns: int = 10,
+        player_best: Optional[list[set[int]]] = None,
+        opponent_best: Optional[list[set[int]]] = None,
+    ) -> None:
+        """
+        writes for each cell whether the player and the opponent are playing a best
+        response, in the same formats as the payoff matrix
+
+        :param player_best: the best responses of the player per strategy of the
+            opponent as sets, if already at hand, otherwise taken from the index
+        :param opponent_best: the same for the opponent per strategy of the player
+        """
+        if player_best is None:
+            player_best = [
+                set(self.best_response.best_responses(self._player, o))
+                for o in range(self._opponent.strategy_set_size())
+            ]
+        if opponent_best is None:
+            opponent_best = [
+                set(self.best_response.best_responses(self._opponent, p))
+                for p in range(self._player.strategy_set_size())
+            ]
+        self._write_cells(
+            stream,
+            lambda p, o: str((p in player_best[o], o in opponent_best[p])),
+            fmt,
+            chunk_size,
+            max_rows,
+            max_columns,
+        )
+
+    def _write_cells(
+        self,
+        stream: TextIO,
+        cell: Callable[[int, int], str],
+        fmt: str,
+        chunk_size: int,
+        max_rows: int,
+        max_columns: int,
+    ) -> None:
+        player_strategy_set: list[Strategy] = self._player.strategy_set
+        header = [strategy.name for strategy in self._opponent.strategy_set]
+
+        if fmt == "summary":
+            write_summary(
+                stream,
+                header,
+                len(player_strategy_set),
+                lambda p, columns: [player_strategy_set[p].name]
+                + [cell(p, o) for o in columns],
+                max_rows,
+                max_columns,
+            )
+            return
+
+        def rows():
+            for p in range(len(player_strategy_set)):
+                yield [player_strategy_set[p].name] + [
+                    cell(p, o) for o in range(len(header))
+                ]
+
+        write_table(stream, header, rows, fmt, chunk_size)
 
     @property
     def players(self):
@@ -285,6 +502,16 @@ class Game:
     def opponent(self) -> Opponent:
         return self._opponent
 
+    @property
+    def best_response(self) -> BestResponse:
+        """
+        returns the best response index of this game, it is built on first use and
+        afterwards maintained by remove_strategy
+        """
+        if self._best_response is None:
+            self._best_response = BestResponse(self)
+        return self._best_response
+
     def pure_nash_equilibrium(self) -> list[tuple[Strategy, Strategy]]:
         """
         checks for pure nash equilibria by identifying 'cells' where both payoffs are
@@ -299,83 +526,87 @@ class Game:
         opponent_strategy_set: list[Strategy] = self._opponent.strategy_set
         player_strategy_set: list[Strategy] = self._player.strategy_set
 
-        # result_matrix holding either true = best response, of false otherwise
         player_strategy_size: int = self._player.strategy_set_size()
         opponent_strategy_size: int = self._opponent.strategy_set_size()
 
-        result_matrix = list()
-        for p in range(player_strategy_size):
-            inner_list = list()
-            for o in range(opponent_strategy_size):
-                entry = list()
-                entry.append(player_strategy_set[p].payoff(o))
-                entry.append(False)
-                entry.append(opponent_strategy_set[o].payoff(p))
-                entry.append(False)
-                inner_list.append(entry)
-            result_matrix.append(inner_list)
-
-        # to check for the player if there are dominant strategies, we need to get his best response 
-        # for every strategy 
-        for o in range(opponent_strategy_size):
-            payoffs = list()
-            for p in range(player_strategy_size):
-                # get each entry and add it to the payoff list
-                payoffs.append(result_matrix[p][o][0])
-            # print(f"   rows payoffs: {payoffs}")
-            for p in range(player_strategy_size):
-                result = is_biggest_in_list(result_matrix[p][o][0], payoffs)
-                result_matrix[p][o][1] = result
-
-        # print(result_matrix)
-
-        # checking now the columns for responses, hence checking the third entries and setting the fourth
+        # the best responses of the player per column and of the opponent per row
+        # are taken from the index instead of searching the maximum for each cell
+        best_response = self.best_response
+        player_best = [
+            set(best_response.best_responses(self._player, o))
+            for o in range(opponent_strategy_size)
+        ]
+        opponent_best = [
+            set(best_response.best_responses(self._opponent, p))
+            for p in range(player_strategy_size)
+        ]
+
+        self.write_best_responses(
+            sys.stdout,
+            fmt="summary",
+            player_best=player_best,
+            opponent_best=opponent_best,
+        )
+
+        # a nash equilibrium is a cell where both are playing a best response
         for p in range(player_strategy_size):
-            payoffs = list()
-            for o in range(opponent_strategy_size):
-                # get each entry list
-                payoffs.append(result_matrix[p][o][2])
-            # print(f"   columns payoffs: {payoffs}")
             for o in range(opponent_strategy_size):
-                # print(f"      testing {result_matrix[p][o][2]} against {payoffs}: {is_biggest_in_list(result_matrix[p][o][2], payoffs)}")
-                result = is_biggest_in_list(result_matrix[p][o][2], payoffs)
-                result_matrix[p][o][3] = result
-
-        # print(result_matrix)
-        header = list()
-        for strategy in opponent_strategy_set:
-            header.append(strategy.name)
-
-        data = list()
-        for p in range(player_strategy_size):
-            row = list()
-            row.append(player_strategy_set[p].name)
-            for o in range(opponent_strategy_size):
-                row.append((result_matrix[p][o][1],result_matrix[p][o][3]))
-            data.append(row)
-
-        print(tabulate(data, header, tablefmt="grid", stralign="center"))
-
-        # a nash equilibrium is a cell which has all entries set to true
-        for p in range(player_strategy_size):
-            for o in range(opponent_strategy_size):
-                if result_matrix[p][o][1] and result_matrix[p][o][3]:
+                if p in player_best[o] and o in opponent_best[p]:
                     nash_equilibria.append(
                         (player_strategy_set[p], opponent_strategy_set[o])
                     )
 
         return nash_equilibria
 
+    def dominated_strategies(
+        self, player: Player, weakly: bool = False, keep_first: bool = False
+    ) -> list[Strategy]:
+        """
+        the same as player.strictly_dominated_strategy() or
+        player.weakly_dominated_strategy(), but the strategies which are the only best
+        response to some strategy of the other player are taken from the best response
+        index and not compared at all
+
+        :param keep_first: strategies with the same payoffs weakly dominate each other,
+            with keep_first only the later ones are dominated by the first of them
+        :return: the dominated strategies in the order of the strategy set
+        :rtype: list[Strategy]
+        """
+        strategy_set = player.strategy_set
+        if len(strategy_set) < 2:
+            return []
+        protected = self.best_response.unique_best_responses(player)
+
+        dominated: list[Strategy] = list()
+        for s, strategy_under_test in enumerate(strategy_set):
+            if s in protected:
+                continue
+            row = strategy_under_test.payoffs
+            for k, strategy_to_test in enumerate(strategy_set):
+                if keep_first and k > s and strategy_to_test.payoffs == row:
+                    continue
+                if strategy_to_test is not strategy_under_test and all(
+                    a <= b if weakly else a < b
+                    for a, b in zip(row, strategy_to_test.payoffs)
+                ):
+                    dominated.append(strategy_under_test)
+                    break
+        return dominated
+
     def solve_by_iterated_deletion(self, use_weakly=True) -> None:
         """
         note: when using "weakly", different outcomes are possible, so the one that the
         algorithm creates, might not be the only possible outcome - only one.
+        weak_elimination_outcomes returns all of them.
 
         This method does not return anything, it has only the side_effect of printing out
         the different steps taken.
 
         You can afterwards use the print game method to show the updated matrix
 
+        Strategies with the same payoffs weakly dominate each other, of those only the
+        first one is kept.
+
         :param : boolean to hint if also weakly dominated strategies shall be removed
         """
 
@@ -385,7 +616,7 @@ class Game:
             print(f"    iteration {counter}")
             further_check_required = False
             for player in self._players:
-                sds = player.strictly_dominated_strategy()
+                sds = self.dominated_strategies(player)
                 if len(sds) > 0:
                     for strategy in sds:
                         print(
@@ -399,7 +630,7 @@ class Game:
                 else:
                     if use_weakly:
                         # no strictly dominated strategy, so try weakly dominated strategy
-                        wds = player.weakly_dominated_strategy()
+                        wds = self.dominated_strategies(player, weakly=True, keep_first=True)
                         if len(wds) > 0:
                             for strategy in wds:
                                 print(
@@ -420,7 +651,11 @@ class Game:
                 break
 
     def mixed_nash_equilibrium(self, player: Player) -> tuple[float, ...]:
-        """ """
+        """
+        the mix of the player in a mixed Nash equilibrium, which makes the other player
+        indifferent between his/her strategies, so it follows from the payoffs of the
+        other player
+        """
         # we need the other player payoffs for our distribution
         player_index = self._players.index(player)
         other_player: Player
@@ -429,23 +664,161 @@ class Game:
         if player_index == 0:
             # the other player is the opponent
             other_player = self.players[1]
-            # and hence we use his/hers strategy_set
-            strategy_set = other_player.strategy_set
         else:
             other_player = self.players[0]
-            strategy_set = other_player.strategy_set
+        strategy_set = other_player.strategy_set
+        # the oddments give a mix over the rows of a strategy set, but the strategies
+        # of the player are the columns of the other players strategy set
+        transposed_set = transpose_strategy_set(strategy_set)
 
-        if len(other_player.strategy_set) == 2:
+        if len(transposed_set) == 2:
             try:
-                return oddments2(strategy_set)
+                return oddments2(transposed_set)
             except ValueError:
                 print(f"  ... need to switch to formula 2x2 ...")
+                # the formula already gives the mix over the columns
                 return formula_2x2(strategy_set)
-        elif len(other_player.strategy_set) == 3:
-            return oddments3(strategy_set)
+        elif len(transposed_set) == 3:
+            return oddments3(transposed_set)
         else:
             raise ValueError("Only strategy sets with a length of 2 or 3 are supported")
 
+    def payoff_matrices(self) -> tuple[list[list[float]], list[list[float]]]:
+        """
+        returns copies of the payoffs of both players in the layout of their strategies,
+        hence the players payoffs per row and the opponents payoffs per column
+        """
+        return (
+            [list(strategy.payoffs) for strategy in self._player.strategy_set],
+            [list(strategy.payoffs) for strategy in self._opponent.strategy_set],
+        )
+
+    def quantal_response_equilibrium(self, lambdas: list[float]) -> list[QREPoint]:
+        """
+        follows the logit quantal response equilibria from lambda = 0, where both
+        players mix uniformly, towards a Nash equilibrium for growing lambda
+
+        :param lambdas: the values of lambda to return the equilibria for
+        :return: a point per lambda holding the mix of the player and the opponent
+        :rtype: list[QREPoint]
+        """
+        player_payoffs, opponent_payoffs = self.payoff_matrices()
+        return logit_qre_path(player_payoffs, opponent_payoffs, lambdas)
+
+    def correlated_equilibrium(self, objective: str = "welfare") -> list[list[float]]:
+        """
+        finds a correlated equilibrium, hence a distribution over the cells of the
+        matrix from which a mediator recommends the strategies, such that no player
+        gains from not following the recommendation
+
+        :param objective: welfare to maximise the sum of both payoffs, or feasible to
+            return any correlated equilibrium
+        :return: the probability of each cell, in the layout of the payoff matrix
+        :rtype: list[list[float]]
+        """
+        player_payoffs, opponent_payoffs = self.payoff_matrices()
+        result = correlated_equilibrium(player_payoffs, opponent_payoffs, objective)
+        columns = self._opponent.strategy_set_size()
+        return [
+            result.x[p * columns : (p + 1) * columns]
+            for p in range(self._player.strategy_set_size())
+        ]
+
+    def support_enumeration(
+        self, guess: Optional[tuple[tuple[int, ...], tuple[int, ...]]] = None
+    ) -> Optional["SupportEquilibrium"]:
+        """
+        finds a mixed NE of any size of game by trying the supports, hence the sets of
+        strategies played, of both players in order of their size
+
+        :param guess: the supports to try first, e.g. those of a similar game
+        :return: the first NE found, or None
+        :rtype: SupportEquilibrium
+        """
+        player_payoffs, opponent_payoffs = self.payoff_matrices()
+        return support_enumeration(player_payoffs, opponent_payoffs, guess)
+
+    def score_profiles(
+        self,
+        profiles: list[tuple[list[float], list[float]]],
+        stop_at: Optional[float] = None,
+    ) -> list["ProfileScore"]:
+        """
+        computes for each candidate profile, a mix of the player and a mix of the opponent,
+        how much each player could gain by deviating
+
+        :param stop_at: stops after the first profile with an epsilon not above this value
+        :return: the regrets, epsilon and exploitability for each profile
+        :rtype: list[ProfileScore]
+        """
+        player_payoffs, opponent_payoffs = self.payoff_matrices()
+        return score_profiles(player_payoffs, opponent_payoffs, profiles, stop_at)
+
+    def is_epsilon_equilibrium(
+        self, player_mix: list[float], opponent_mix: list[float], epsilon: float = 1e-9
+    ) -> bool:
+        """
+        checks if neither player can gain more than epsilon by deviating from the profile
+        """
+        return self.score_profiles([(player_mix, opponent_mix)])[0].epsilon <= epsilon
+
+    def snapshot(self) -> "GameView":
+        """
+        returns an immutable view of the game as it is now, removing strategies from
+        the view gives new views sharing the payoffs, so the game itself stays intact
+        """
+        player_payoffs, opponent_payoffs = self.payoff_matrices()
+        return GameView(
+            player_payoffs,
+            opponent_payoffs,
+            [s.name for s in self._player.strategy_set],
+            [s.name for s in self._opponent.strategy_set],
+        )
+
+    def weak_elimination_outcomes(self, count_orders: bool = False) -> list["EliminationOutcome"]:
+        """
+        unlike solve_by_iterated_deletion, which finds only one of the games left by
+        removing weakly dominated strategies, this returns all of them, see
+        GameView.weak_elimination_outcomes. The game itself is not changed.
+        """
+        return self.snapshot().weak_elimination_outcomes(count_orders)
+
+    def collapse_duplicates(self) -> "Duplicates":
+        """
+        removes every strategy which gives both players the same payoffs as an earlier
+        strategy of the same player, as it is interchangeable with that one for every
+        solver. The strategies are grouped by hashing their payoffs, so this takes a
+        single pass over the payoffs.
+
+        Only exact equivalence is collapsed: scaling the payoffs of a single strategy
+        changes how it compares to the other strategies, so it is not the same strategy.
+
+        :return: the original strategies and the removed duplicates, to expand results
+            afterwards
+        :rtype: Duplicates
+        """
+        original = (list(self._player.strategy_set), list(self._opponent.strategy_set))
+        classes: dict[Strategy, list[Strategy]] = dict()
+
+        for side, player in enumerate(self._players):
+            other = self._players[1 - side]
+            kept: dict[tuple, Strategy] = dict()
+            removed: list[Strategy] = list()
+            for index, strategy in enumerate(player.strategy_set):
+                key = (
+                    tuple(strategy.payoffs),
+                    tuple(s.payoff(index) for s in other.strategy_set),
+                )
+                if key in kept:
+                    classes.setdefault(kept[key], []).append(strategy)
+                    removed.append(strategy)
+                else:
+                    kept[key] = strategy
+            for strategy in removed:
+                self.remove_strategy(player, strategy)
+
+        return Duplicates(original[0], original[1], classes)
+
     def remove_strategy(self, player: Player, strategy: Strategy) -> None:
         """
         removing a strategy means for the player to drop his/her strategy,
@@ -463,6 +836,405 @@ class Game:
             # print(f"payoffs: {strategy.payoffs}, need to remove {strategy_index}")
             strategy.payoffs.pop(strategy_index)
 
+        if self._best_response is not None:
+            self._best_response.remove(player_index, strategy_index)
+
+
+class GameView:
+    """
+    an immutable view on the payoffs of a game, which are shared by all views taken
+    from the same snapshot. The view only holds the indices of the remaining
+    strategies, so removing a strategy is cheap and leaves the view unchanged.
+
+    All strategies are referred to by their index in the snapshot.
+    """
+
+    __slots__ = ("_payoffs", "_names", "_remaining", "_dominators")
+
+    def __init__(
+        self,
+        player_payoffs: list[list[float]],
+        opponent_payoffs: list[list[float]],
+        player_names: list[str],
+        opponent_names: list[str],
+    ):
+        """
+        :param player_payoffs: player_payoffs[p][o], as returned by Game.payoff_matrices
+        :param opponent_payoffs: opponent_payoffs[o][p]
+        """
+        if len(player_payoffs) != len(player_names) or len(opponent_payoffs) != len(
+            opponent_names
+        ):
+            raise ValueError("Every strategy needs a name")
+        self._payoffs = (
+            tuple(tuple(row) for row in player_payoffs),
+            tuple(tuple(row) for row in opponent_payoffs),
+        )
+        self._names = (tuple(player_names), tuple(opponent_names))
+        self._remaining = (tuple(range(len(player_names))), tuple(range(len(opponent_names))))
+        # the dominating strategies only depend on the remaining strategies of the other
+        # side, so they are shared by all views of the snapshot
+        self._dominators: dict[tuple, dict[int, frozenset[int]]] = dict()
+
+    def _with(self, remaining: tuple[tuple[int, ...], tuple[int, ...]]) -> "GameView":
+        view = object.__new__(GameView)
+        view._payoffs = self._payoffs
+        view._names = self._names
+        view._remaining = remaining
+        view._dominators = self._dominators
+        return view
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, GameView)
+            and self._payoffs is other._payoffs
+            and self._remaining == other._remaining
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._payoffs), self._remaining))
+
+    def __str__(self):
+        return f"{list(self.names(0))} x {list(self.names(1))}"
+
+    __repr__ = __str__
+
+    def remaining(self, side: int) -> tuple[int, ...]:
+        """
+        the indices of the remaining strategies of the player (side 0) or the opponent
+        (side 1)
+        """
+        return self._remaining[side]
+
+    def names(self, side: int) -> tuple[str, ...]:
+        return tuple(self._names[side][s] for s in self._remaining[side])
+
+    def payoff_matrices(self) -> tuple[list[list[float]], list[list[float]]]:
+        """
+        the payoffs of the remaining strategies in the layout of Game.payoff_matrices
+        """
+        rows, columns = self._remaining
+        player_payoffs, opponent_payoffs = self._payoffs
+        return (
+            [[player_payoffs[p][o] for o in columns] for p in rows],
+            [[opponent_payoffs[o][p] for p in rows] for o in columns],
+        )
+
+    def remove(self, side: int, strategies) -> "GameView":
+        """
+        returns a new view without the given strategy, or strategies, of the side
+        """
+        if isinstance(strategies, int):
+            strategies = (strategies,)
+        gone = set(strategies)
+        if not gone <= set(self._remaining[side]):
+            raise ValueError("Strategy is not part of the view")
+        remaining = list(self._remaining)
+        remaining[side] = tuple(s for s in self._remaining[side] if s not in gone)
+        return self._with((remaining[0], remaining[1]))
+
+    def dominated(self, side: int, weakly: bool = False, keep_first: bool = False) -> list[int]:
+        """
+        the strategies of the side that are strictly, or weakly, dominated by another
+        remaining strategy, with the meaning of DefaultPlayer.strictly_dominated_strategy
+        and DefaultPlayer.weakly_dominated_strategy
+
+        :param keep_first: strategies with the same payoffs weakly dominate each other,
+            with keep_first only the later ones are dominated by the first of them
+        """
+        own = self._remaining[side]
+        present = set(own)
+        return [
+            s
+            for s in own
+            if not self._dominating(side, s, weakly, keep_first).isdisjoint(present)
+        ]
+
+    def is_dominated(self, side: int, strategy: int, weakly: bool = False) -> bool:
+        """
+        whether the remaining strategy of the side is dominated by another remaining one,
+        without testing the other strategies of the side
+        """
+        return not self._dominating(side, strategy, weakly, False).isdisjoint(
+            self._remaining[side]
+        )
+
+    def _dominating(self, side: int, s: int, weakly: bool, keep_first: bool) -> frozenset[int]:
+        """
+        all strategies of the snapshot dominating s on the remaining strategies of the
+        other side, computed once for all views of the snapshot
+        """
+        other = self._remaining[1 - side]
+        found = self._dominators.setdefault((side, weakly, keep_first, other), dict())
+        if s not in found:
+            payoffs = self._payoffs[side]
+            row = payoffs[s]
+            dominating = set()
+            for k, candidate in enumerate(payoffs):
+                if k == s:
+                    continue
+                if keep_first and k > s and all(row[c] == candidate[c] for c in other):
+                    continue
+                if all(row[c] <= candidate[c] if weakly else row[c] < candidate[c] for c in other):
+                    dominating.add(k)
+            found[s] = frozenset(dominating)
+        return found[s]
+
+    def groups(self, side: int, both: bool = False) -> list[list[int]]:
+        """
+        the remaining strategies of the side grouped by their payoffs against the
+        remaining strategies of the other side, in the order of their first strategy
+
+        :param both: group by the payoffs of both players, not just the ones of the side
+        """
+        own_payoffs = self._payoffs[side]
+        other_payoffs = self._payoffs[1 - side]
+        other = self._remaining[1 - side]
+        groups: dict[tuple, list[int]] = dict()
+        for s in self._remaining[side]:
+            key = tuple(own_payoffs[s][c] for c in other)
+            if both:
+                key = (key, tuple(other_payoffs[c][s] for c in other))
+            groups.setdefault(key, []).append(s)
+        return list(groups.values())
+
+    def duplicates(self, side: int) -> list[int]:
+        """
+        the strategies of the side giving both players the same payoffs as an earlier
+        remaining strategy, see Game.collapse_duplicates
+        """
+        return sorted(s for group in self.groups(side, both=True) for s in group[1:])
+
+    def pure_nash_equilibria(self) -> list[tuple[int, int]]:
+        """
+        the pure nash equilibria as pairs of strategies, in the order of
+        Game.pure_nash_equilibrium
+        """
+        rows, columns = self._remaining
+        player_payoffs, opponent_payoffs = self._payoffs
+        player_best = {
+            o: max(player_payoffs[p][o] for p in rows) for o in columns
+        } if rows else {}
+        opponent_best = {
+            p: max(opponent_payoffs[o][p] for o in columns) for p in rows
+        } if columns else {}
+        return [
+            (p, o)
+            for p in rows
+            for o in columns
+            if player_payoffs[p][o] == player_best[o]
+            and opponent_payoffs[o][p] == opponent_best[p]
+        ]
+
+    def weak_elimination_outcomes(self, count_orders: bool = False) -> list["EliminationOutcome"]:
+        """
+        explores every order of removing weakly dominated strategies one at a time and
+        returns the distinct games they end in, in the order they are first reached
+
+        Many orders pass through the same remaining strategies, so the outcomes of each
+        such state are searched once and remembered. Strategies giving both players the
+        same payoffs are interchangeable: the search always removes the last remaining
+        one of them, so games that only differ in which of them remain are one outcome,
+        keeping the first ones.
+
+        Most removals do not depend on each other, so their orders still pass through
+        exponentially many states. Unless the orders are counted, the search only
+        follows the removals of a stubborn set (Valmari 1991) in each state: the removals
+        left out can neither disable nor enable the ones followed, so they are still
+        possible afterwards, and every game at the end is reached through far fewer
+        states. A removal which can never be undone, because the strategy can never come
+        to equal one dominating it, is a stubborn set of its own.
+
+        Deciding whether a strategy can be removed at all is NP-complete (Conitzer and
+        Sandholm 2005), so some games still need exponentially many states: a dominant
+        strategy over 10 strategies it weakly dominates, each worse against a different
+        one of 10 opponent strategies with random payoffs, takes about a minute.
+
+        :param count_orders: count the orders reaching each game, which needs every
+            state and is only feasible for small games
+        """
+        # the strategies of each side grouped by their payoffs for both players
+        classes: list[dict[int, list[int]]] = [dict(), dict()]
+        for side in range(2):
+            for group in self.groups(side, both=True):
+                for s in group:
+                    classes[side][s] = group
+
+        # better[side][(d, j)] lists the strategies of the other side where d gets more
+        # than j, which all need to be removed before j dominates d
+        better: list[dict[tuple[int, int], tuple[int, ...]]] = [dict(), dict()]
+
+        def protecting(side: int, d: int, j: int) -> tuple[int, ...]:
+            if (d, j) not in better[side]:
+                payoffs = self._payoffs[side]
+                better[side][(d, j)] = tuple(
+                    c for c in range(len(payoffs[d])) if payoffs[d][c] > payoffs[j][c]
+                )
+            return better[side][(d, j)]
+
+        def guarded(
+            side: int,
+            d: int,
+            j: int,
+            present: tuple[set[int], set[int]],
+            kept: set[tuple[int, int]],
+        ) -> bool:
+            """
+            whether j can never come to dominate d: d gets more against every remaining
+            strategy of the other side, of which one always stays, or against a kept one
+            """
+            columns = [c for c in protecting(side, d, j) if c in present[1 - side]]
+            return len(columns) == len(present[1 - side]) or any(
+                (1 - side, c) in kept for c in columns
+            )
+
+        def never_removed(
+            present: tuple[set[int], set[int]], enabled: set[tuple[int, int]]
+        ) -> set[tuple[int, int]]:
+            """
+            the strategies which are not removed in any order: the largest set of them
+            where each one gets more than every other remaining strategy of its side
+            against one of the set, which is then never removed either
+            """
+            kept = {(side, s) for side in range(2) for s in present[side]} - enabled
+            changed = True
+            while changed:
+                changed = False
+                for side, s in list(kept):
+                    if any(
+                        j != s and not guarded(side, s, j, present, kept)
+                        for j in present[side]
+                    ):
+                        kept.discard((side, s))
+                        changed = True
+            return kept
+
+        def stubborn(view: GameView, enabled: list[tuple[int, int]]) -> list[tuple[int, int]]:
+            """
+            the smallest set of enabled removals, among the stubborn sets grown from each
+            enabled removal: a removal brings in one of the strategies dominating it, a
+            strategy not dominated brings in, for every strategy which might come to
+            dominate it, one of the other sides strategies protecting it
+            """
+            present = (set(view._remaining[0]), set(view._remaining[1]))
+            enabled_set = set(enabled)
+            permanent = never_removed(present, enabled_set)
+            needs: dict[tuple[int, int], list[list[tuple[int, int]]]] = dict()
+
+            def needed(move: tuple[int, int]) -> list[list[tuple[int, int]]]:
+                """
+                what the move brings in, as lists of strategies of which one is enough,
+                the ones not dominated first
+                """
+                if move in permanent:
+                    # it is never removed, so none of its removals can be left out
+                    return []
+                if move not in needs:
+                    side, s = move
+                    if move in enabled_set and all(
+                        j == s
+                        or guarded(side, s, j, present, permanent)
+                        or guarded(side, j, s, present, permanent)
+                        for j in present[side]
+                    ):
+                        # a strategy only stops being dominated when it comes to equal its
+                        # last dominator, and it can not come to equal any of them
+                        needs[move] = []
+                    elif move in enabled_set:
+                        # it stays dominated as long as one of its dominators is kept
+                        dominators = [
+                            (side, k)
+                            for k in view._dominating(side, s, True, False)
+                            if k in present[side]
+                        ]
+                        needs[move] = [sorted(dominators, key=lambda k: k in enabled_set)]
+                    else:
+                        needs[move] = list()
+                        for j in present[side]:
+                            if j == s or guarded(side, s, j, present, permanent):
+                                continue
+                            # j can not come to dominate it while one of the columns stays
+                            columns = [
+                                (1 - side, c)
+                                for c in protecting(side, s, j)
+                                if c in present[1 - side]
+                            ]
+                            needs[move].append(sorted(columns, key=lambda c: c in enabled_set))
+                return needs[move]
+
+            best: Optional[list[tuple[int, int]]] = None
+            for seed in enabled:
+                closure = {seed}
+                stack = [seed]
+                chosen = list()
+                while stack and (best is None or len(chosen) < len(best)):
+                    move = stack.pop()
+                    if move in enabled_set:
+                        chosen.append(move)
+                    for choices in needed(move):
+                        if not any(other in closure for other in choices):
+                            closure.add(choices[0])
+                            stack.append(choices[0])
+                if not stack and (best is None or len(chosen) < len(best)):
+                    best = chosen
+                    if len(best) == 1:
+                        break
+            return sorted(best)
+
+        memo: dict[tuple, dict[tuple, tuple[Optional[int], list[tuple[int, int]]]]] = dict()
+
+        def outcomes(view: GameView) -> dict[tuple, tuple[Optional[int], list[tuple[int, int]]]]:
+            state = view._remaining
+            if state in memo:
+                return memo[state]
+            found: dict[tuple, tuple[Optional[int], list[tuple[int, int]]]] = dict()
+            enabled = [(side, s) for side in range(2) for s in view.dominated(side, weakly=True)]
+            if enabled and not count_orders:
+                enabled = stubborn(view, enabled)
+            moves = list()
+            for side, s in enabled:
+                own = set(state[side])
+                present = [k for k in classes[side][s] if k in own]
+                # one move per group of interchangeable strategies, which are all dominated
+                # together
+                if (side, present[-1], len(present)) not in moves:
+                    moves.append((side, present[-1], len(present)))
+            if not moves:
+                found[state] = (1 if count_orders else None, [])
+            for side, s, ways in moves:
+                for end, (count, order) in outcomes(view.remove(side, s)).items():
+                    if end not in found:
+                        found[end] = (ways * count if count_orders else None, [(side, s)] + order)
+                    elif count_orders:
+                        found[end] = (found[end][0] + ways * count, found[end][1])
+            memo[state] = found
+            return found
+
+        return [
+            EliminationOutcome(self._with(end), order, count)
+            for end, (count, order) in outcomes(self).items()
+        ]
+
+    def iterated_deletion(self, use_weakly: bool = True) -> "GameView":
+        """
+        the view left by the steps of Game.solve_by_iterated_deletion, without
+        printing them
+        """
+        view = self
+        further_check_required = True
+        while further_check_required:
+            further_check_required = False
+            for side in range(2):
+                if len(view.remaining(side)) < 2:
+                    continue
+                found = view.dominated(side)
+                if not found and use_weakly:
+                    found = view.dominated(side, weakly=True, keep_first=True)
+                if found:
+                    view = view.remove(side, found)
+                    further_check_required = True
+        return view
+
 
 def find_dominant_strategies():
     ...
@@ -579,6 +1351,346 @@ def oddments3(strategy_set: list[Strategy]) -> tuple[float, float, float]:
     )
 
 
+def correlated_equilibrium_constraints(
+    player_payoffs: list[list[float]], opponent_payoffs: list[list[float]]
+) -> list[dict[int, float]]:
+    """
+    builds the incentive constraints of a correlated equilibrium as sparse rows of the
+    form row * x <= 0, where x[p * columns + o] is the probability of the cell (p, o)
+
+    For every recommended strategy and every deviation, the payoff given up by deviating
+    has to be non negative, so only the cells of the recommended strategy show up in a row.
+
+    :param player_payoffs: the payoffs of the player, one list per strategy of the player
+    :param opponent_payoffs: the payoffs of the opponent, one list per strategy of the opponent
+    """
+    rows = len(player_payoffs)
+    columns = len(opponent_payoffs)
+    constraints: list[dict[int, float]] = list()
+
+    # the player is recommended p, but considers to play d instead
+    for p in range(rows):
+        for d in range(rows):
+            if p != d:
+                gains = [
+                    d_payoff - p_payoff
+                    for p_payoff, d_payoff in zip(player_payoffs[p], player_payoffs[d])
+                ]
+                constraints.append(
+                    {p * columns + o: gain for o, gain in enumerate(gains) if gain != 0}
+                )
+
+    # the opponent is recommended o, but considers to play d instead
+    for o in range(columns):
+        for d in range(columns):
+            if o != d:
+                gains = [
+                    d_payoff - o_payoff
+                    for o_payoff, d_payoff in zip(opponent_payoffs[o], opponent_payoffs[d])
+                ]
+                constraints.append(
+                    {p * columns + o: gain for p, gain in enumerate(gains) if gain != 0}
+                )
+
+    return constraints
+
+
+def correlated_equilibrium(
+    player_payoffs: list[list[float]],
+    opponent_payoffs: list[list[float]],
+    objective: str = "welfare",
+    basis: Optional[list[int]] = None,
+) -> LPResult:
+    """
+    solves the linear program of a correlated equilibrium
+
+    It has rows * (rows - 1) + columns * (columns - 1) + 1 constraints on rows * columns
+    cells, so it grows with the fourth power of the number of strategies. Games of 15
+    strategies each take a few seconds, but close to zero-sum games of 20 strategies
+    each take about half a minute and those of 25 to 30 several minutes.
+
+    :param objective: welfare to maximise the sum of both payoffs, or feasible
+    :param basis: the basis of a previous, similar problem to warm start from
+    :return: the result of the linear program, x holds the probability of the cell
+        (p, o) at p * columns + o
+    :rtype: LPResult
+    """
+    rows = len(player_payoffs)
+    columns = len(opponent_payoffs)
+
+    if objective == "welfare":
+        c = [
+            player_payoffs[p][o] + opponent_payoffs[o][p]
+            for p in range(rows)
+            for o in range(columns)
+        ]
+    elif objective == "feasible":
+        c = [0.0] * (rows * columns)
+    else:
+        raise ValueError("Objective must be either welfare or feasible")
+
+    if objective == "feasible":
+        # any pure NE is a correlated equilibrium as well
+        for p in range(rows):
+            for o in range(columns):
+                if player_payoffs[p][o] == max(
+                    payoffs[o] for payoffs in player_payoffs
+                ) and opponent_payoffs[o][p] == max(
+                    payoffs[p] for payoffs in opponent_payoffs
+                ):
+                    x = [0.0] * (rows * columns)
+                    x[p * columns + o] = 1.0
+                    return LPResult(x, 0.0, [], [])
+
+    # the incentive constraints form a cone, so rather than requiring the probabilities
+    # to sum up to 1, their sum is bounded by 1 and the objective shifted to be positive.
+    # The optimum still sums up to 1, and the slacks are a feasible basis to start from.
+    shift = 1 - min(c, default=0)
+    constraints = correlated_equilibrium_constraints(player_payoffs, opponent_payoffs)
+    constraints.append([1.0] * (rows * columns))
+    result = linprog(
+        [v + shift for v in c],
+        constraints,
+        [0.0] * (len(constraints) - 1) + [1.0],
+        basis=basis,
+    )
+
+    total = sum(result.x)
+    x = [v / total for v in result.x]
+    return LPResult(x, sum(v * w for v, w in zip(c, x)), result.basis, result.duals)
+
+
+class SupportEquilibrium(NamedTuple):
+    """
+    a mixed NE together with the supports, the indices of the strategies played
+    """
+
+    player: list[float]
+    opponent: list[float]
+    player_support: tuple[int, ...]
+    opponent_support: tuple[int, ...]
+
+
+def support_enumeration(
+    player_payoffs: list[list[float]],
+    opponent_payoffs: list[list[float]],
+    guess: Optional[tuple[tuple[int, ...], tuple[int, ...]]] = None,
+    eps: float = 1e-9,
+) -> Optional[SupportEquilibrium]:
+    """
+    Support Enumeration Method (Porter et al. 2004) for supports of equal size
+
+    For each pair of supports the mix of each player is the one making the other player
+    indifferent between the strategies of his/her support. It is a NE if both mixes are
+    proper distributions and no strategy outside the supports pays more.
+
+    :param player_payoffs: the payoffs of the player, one list per strategy of the player
+    :param opponent_payoffs: the payoffs of the opponent, one list per strategy of the opponent
+    :param guess: the supports to try first
+    :return: the first NE found, or None
+    :rtype: SupportEquilibrium
+    """
+    rows = len(player_payoffs)
+    columns = len(opponent_payoffs)
+
+    def candidates():
+        if guess is not None:
+            yield guess
+        for size in range(1, min(rows, columns) + 1):
+            for player_support in combinations(range(rows), size):
+                for opponent_support in combinations(range(columns), size):
+                    yield player_support, opponent_support
+
+    for player_support, opponent_support in candidates():
+        # the opponents mix makes the player indifferent on his/her support and vice versa
+        y = _indifferent_mix(player_payoffs, player_support, opponent_support, columns, eps)
+        if y is None:
+            continue
+        x = _indifferent_mix(opponent_payoffs, opponent_support, player_support, rows, eps)
+        if x is None:
+            continue
+        if _is_best_response(player_payoffs, player_support, y, eps) and _is_best_response(
+            opponent_payoffs, opponent_support, x, eps
+        ):
+            return SupportEquilibrium(x, y, tuple(player_support), tuple(opponent_support))
+
+    return None
+
+
+def _indifferent_mix(
+    payoffs: list[list[float]],
+    support: tuple[int, ...],
+    other_support: tuple[int, ...],
+    other_size: int,
+    eps: float,
+) -> Optional[list[float]]:
+    """
+    returns the mix over other_support making the strategies in support pay the same,
+    or None if there is no such distribution
+    """
+    size = len(support)
+    if size != len(other_support):
+        return None
+    # unknowns are the probabilities of other_support followed by the common payoff
+    matrix = [[payoffs[s][o] for o in other_support] + [-1.0] for s in support]
+    matrix.append([1.0] * size + [0.0])
+    try:
+        solution = solve(matrix, [0.0] * size + [1.0])
+    except ValueError:
+        return None
+    if any(q < -eps for q in solution[:size]):
+        return None
+    mix = [0.0] * other_size
+    for o, q in zip(other_support, solution):
+        mix[o] = max(q, 0.0)
+    return mix
+
+
+def _is_best_response(
+    payoffs: list[list[float]], support: tuple[int, ...], mix: list[float], eps: float
+) -> bool:
+    expected = [sum(p * q for p, q in zip(row, mix)) for row in payoffs]
+    return max(expected) <= min(expected[s] for s in support) + eps
+
+
+class EliminationOutcome(NamedTuple):
+    """
+    a game reached by removing weakly dominated strategies one at a time, one of the
+    orders reaching it as (player index, strategy index) and the number of such orders,
+    if they were counted
+    """
+
+    view: GameView
+    order: list[tuple[int, int]]
+    orders: Optional[int]
+
+
+class Duplicates(NamedTuple):
+    """
+    the strategies of both players before collapsing duplicates, and for every kept
+    strategy with duplicates the strategies removed in its favour
+    """
+
+    player: list[Strategy]
+    opponent: list[Strategy]
+    classes: dict[Strategy, list[Strategy]]
+
+    def expand_equilibria(
+        self, equilibria: list[tuple[Strategy, Strategy]]
+    ) -> list[tuple[Strategy, Strategy]]:
+        """
+        replaces each pure equilibrium of the collapsed game by all combinations of
+        the duplicates, ordered like the original strategies
+        """
+        player_order = {s: i for i, s in enumerate(self.player)}
+        opponent_order = {s: i for i, s in enumerate(self.opponent)}
+        expanded = [
+            (p, o)
+            for kept_p, kept_o in equilibria
+            for p in [kept_p] + self.classes.get(kept_p, [])
+            for o in [kept_o] + self.classes.get(kept_o, [])
+        ]
+        return sorted(expanded, key=lambda e: (player_order[e[0]], opponent_order[e[1]]))
+
+    def expand_mix(self, strategies: list[Strategy], mix: list[float]) -> list[float]:
+        """
+        maps a mix over the strategies of a player in the collapsed game to the original
+        strategies of that player, the duplicates are not played
+
+        :param strategies: the strategy set of the player in the collapsed game
+        """
+        if len(strategies) != len(mix):
+            raise ValueError("Mix does not match the strategies")
+        original = self.player if not strategies or strategies[0] in self.player else self.opponent
+        probabilities = dict(zip(strategies, mix))
+        return [probabilities.get(s, 0.0) for s in original]
+
+
+class ProfileScore(NamedTuple):
+    """
+    the regret of a player is the gain of his/her best response over the mix played,
+    epsilon the bigger and exploitability the sum of both regrets
+    """
+
+    player_regret: float
+    opponent_regret: float
+    epsilon: float
+    exploitability: float
+
+
+def score_profiles(
+    player_payoffs: list[list[float]],
+    opponent_payoffs: list[list[float]],
+    profiles: list[tuple[list[float], list[float]]],
+    stop_at: Optional[float] = None,
+) -> list[ProfileScore]:
+    """
+    scores a batch of profiles in one pass, the payoff columns are built once so a mix
+    playing only a few strategies adds up just those columns
+
+    :param profiles: pairs of the mix of the player and the mix of the opponent, a mix
+        may also be given as oddments, like the counts returned by williams.solve
+    :param stop_at: stops after the first profile with an epsilon not above this value,
+        so the scores returned end with that profile
+    :raise: ValueError when a mix does not match the strategies or has negative entries
+    """
+    rows = len(player_payoffs)
+    columns = len(opponent_payoffs)
+    # the payoffs of the player per strategy of the opponent and vice versa
+    player_columns = [list(column) for column in zip(*player_payoffs)]
+    opponent_columns = [list(column) for column in zip(*opponent_payoffs)]
+
+    scores: list[ProfileScore] = list()
+    for player_mix, opponent_mix in profiles:
+        if len(player_mix) != rows or len(opponent_mix) != columns:
+            raise ValueError("Mix does not match the strategy sets")
+        player_mix = _normalised(player_mix)
+        opponent_mix = _normalised(opponent_mix)
+
+        player_regret = _regret(
+            player_payoffs, player_columns, player_mix, opponent_mix
+        )
+        opponent_regret = _regret(
+            opponent_payoffs, opponent_columns, opponent_mix, player_mix
+        )
+        scores.append(
+            ProfileScore(
+                player_regret,
+                opponent_regret,
+                max(player_regret, opponent_regret),
+                player_regret + opponent_regret,
+            )
+        )
+        if stop_at is not None and scores[-1].epsilon <= stop_at:
+            break
+    return scores
+
+
+def _normalised(mix: list[float]) -> list[float]:
+    total = sum(mix)
+    if any(q < 0 for q in mix) or total <= 0:
+        raise ValueError("Mix must have non negative weights with a positive sum")
+    return [q / total for q in mix]
+
+
+def _regret(
+    payoffs: list[list[float]],
+    columns: list[list[float]],
+    own_mix: list[float],
+    other_mix: list[float],
+) -> float:
+    # the expected payoff of every own strategy against the mix of the other
+    support = [(column, q) for column, q in zip(columns, other_mix) if q != 0]
+    if 3 * len(support) < len(other_mix):
+        expected = [0.0] * len(payoffs)
+        for column, q in support:
+            expected = [e + q * payoff for e, payoff in zip(expected, column)]
+    else:
+        expected = [sum(map(mul, row, other_mix)) for row in payoffs]
+    played = sum(map(mul, own_mix, expected))
+    return max(max(expected) - played, 0.0)
+
+
 def transpose_strategy_set(strategy_set) -> list[Strategy]:
     strategies: int = len(strategy_set)
     payoffs_size: int = len(strategy_set[0].payoffs)
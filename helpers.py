@@ -0,0 +1,26 @@
+"""
+Helpers shared by the tests.
+"""
+
+import random
+
+from game import Game, Opponent, Player
+
+
+def random_payoffs(rng: random.Random, m: int, n: int, high: int = 3) -> tuple[str, str]:
+    """
+    the payoffs of a random game with m strategies of the player and n of the
+    opponent, as strings in the format of the *.ini files
+    """
+    player = ", ".join(
+        "(" + ", ".join(str(rng.randint(0, high)) for _ in range(n)) + ")" for _ in range(m)
+    )
+    opponent = ", ".join(
+        "(" + ", ".join(str(rng.randint(0, high)) for _ in range(m)) + ")" for _ in range(n)
+    )
+    return player, opponent
+
+
+def random_game(rng: random.Random, m: int, n: int, high: int = 3) -> Game:
+    player, opponent = random_payoffs(rng, m, n, high)
+    return Game(Player("P", player), Opponent("O", opponent))
@@ -0,0 +1,49 @@
+"""
+Small dense linear algebra helpers on plain lists, enough for the solvers of
+this project without pulling in a numerical library.
+"""
+
+
+def solve(matrix: list[list[float]], rhs: list[float], eps: float = 1e-12) -> list[float]:
+    """
+    solves the square system matrix * x = rhs by gaussian elimination with partial pivoting
+
+    :raise: ValueError when the matrix is (numerically) singular
+    :return: the solution x
+    :rtype: list[float]
+    """
+    size = len(matrix)
+    if len(rhs) != size or any(len(row) != size for row in matrix):
+        raise ValueError("Matrix must be square and match the right hand side")
+
+    # work on an augmented copy, so the caller's lists stay untouched
+    augmented = [list(row) + [b] for row, b in zip(matrix, rhs)]
+
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda r: abs(augmented[r][column]))
+        if abs(augmented[pivot][column]) < eps:
+            raise ValueError("Matrix is singular")
+        augmented[column], augmented[pivot] = augmented[pivot], augmented[column]
+
+        pivot_row = augmented[column]
+        for r in range(column + 1, size):
+            row = augmented[r]
+            factor = row[column] / pivot_row[column]
+            if factor != 0:
+                for c in range(column, size + 1):
+                    row[c] -= factor * pivot_row[c]
+
+    x = [0.0] * size
+    for r in range(size - 1, -1, -1):
+        row = augmented[r]
+        total = row[size] - sum(row[c] * x[c] for c in range(r + 1, size))
+        x[r] = total / row[r]
+    return x
+
+
+def dot(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def norm(a: list[float]) -> float:
+    return dot(a, a) ** 0.5
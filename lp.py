@@ -0,0 +1,428 @@
+"""
+A small two-phase revised simplex method on plain lists and dicts.
+
+The problems handled are of the form
+
+    maximise c * x  subject to  A_ub x <= b_ub,  A_eq x = b_eq,  x >= 0
+
+where the rows of A_ub and A_eq can be given sparse as dicts mapping the index of
+a variable to its coefficient. A basis returned by a previous solve can be passed
+in again, so a sequence of closely related problems can be warm started.
+
+The constraints are kept as sparse columns and only the basis is factored, as a
+product of eta matrices which is rebuilt every REFACTOR pivots, so the work of a
+pivot grows with the number of non zero coefficients rather than with the number
+of rows times the number of columns.
+"""
+
+from operator import mul
+from typing import NamedTuple, Optional, Union
+
+Row = Union[dict[int, float], list[float]]
+
+# relative size of the perturbation of the right hand side against stalling
+PERTURBATION = 1e-7
+
+# the number of pivots after which the factors of the basis are rebuilt
+REFACTOR = 64
+
+
+class LPResult(NamedTuple):
+    """
+    the solution of a linear program
+
+    x holds the values of the variables, value the objective, basis the columns of
+    the final basis (variables first, then one slack per inequality row) and duals
+    the shadow prices of the inequality rows
+    """
+
+    x: list[float]
+    value: float
+    basis: list[int]
+    duals: list[float]
+
+
+def linprog(
+    c: list[float],
+    rows_ub: list[Row] = (),
+    b_ub: list[float] = (),
+    rows_eq: list[Row] = (),
+    b_eq: list[float] = (),
+    basis: Optional[list[int]] = None,
+    eps: float = 1e-9,
+    max_iterations: int = 100000,
+) -> LPResult:
+    """
+    maximises c * x subject to the inequality and equality rows and x >= 0
+
+    :param basis: a basis of a previous result to start from, it is only used if it
+        is still feasible, otherwise the problem is solved from scratch
+    :raise: ValueError when the problem is infeasible or unbounded
+    :return: the optimal solution
+    :rtype: LPResult
+    """
+    if len(rows_ub) != len(b_ub) or len(rows_eq) != len(b_eq):
+        raise ValueError("Every row needs a right hand side")
+
+    simplex = _RevisedSimplex(c, rows_ub, b_ub, rows_eq, b_eq, eps, max_iterations)
+    if basis is None or not simplex.warm_start(basis):
+        if basis is not None:
+            simplex = _RevisedSimplex(c, rows_ub, b_ub, rows_eq, b_eq, eps, max_iterations)
+        simplex.phase_one()
+    simplex.phase_two()
+    return simplex.result()
+
+
+def _as_dict(row: Row) -> dict[int, float]:
+    if isinstance(row, dict):
+        return row
+    return {j: a for j, a in enumerate(row) if a != 0}
+
+
+def _forward(etas: list[tuple[int, float, list[int], list[float]]], x: list[float]) -> list[float]:
+    """
+    multiplies x by the etas in turn, overwriting x
+    """
+    for r, pivot, indices, coefficients in etas:
+        xr = x[r]
+        if xr:
+            xr /= pivot
+            x[r] = xr
+            for i, a in zip(indices, coefficients):
+                x[i] -= a * xr
+    return x
+
+
+def _backward(etas: list[tuple[int, float, list[int], list[float]]], y: list[float]) -> list[float]:
+    """
+    multiplies the row vector y by the etas from the last one, overwriting y
+    """
+    for r, pivot, indices, coefficients in reversed(etas):
+        y[r] = (y[r] - sum(map(mul, map(y.__getitem__, indices), coefficients))) / pivot
+    return y
+
+
+class _RevisedSimplex:
+    """
+    the constraints as sparse columns of row indices and coefficients, and the basis
+    as the column basic in each row
+
+    The inverse of the basis is a product of eta matrices, each given by its pivot row,
+    the pivot and the other non zero entries of a column in terms of the previous ones.
+    When it is rebuilt, the slacks keep their own rows and only the kernel, the other
+    columns in the remaining rows, is factored. Their entries in the rows of the slacks
+    are the border, which is subtracted once the kernel is solved. The pivots since
+    then follow as etas over all rows.
+    """
+
+    def __init__(self, c, rows_ub, b_ub, rows_eq, b_eq, eps, max_iterations):
+        self.eps = eps
+        self.max_iterations = max_iterations
+        self.n = len(c)
+        self.n_ub = len(rows_ub)
+        self.c = [float(v) for v in c]
+
+        rows = [(_as_dict(r), float(b), True) for r, b in zip(rows_ub, b_ub)]
+        rows += [(_as_dict(r), float(b), False) for r, b in zip(rows_eq, b_eq)]
+
+        # every row gets a slack if it is an inequality, and an artificial variable
+        # if the slack can not serve as the starting basis
+        self.limit = self.n + self.n_ub
+        columns: list[dict[int, float]] = [dict() for _ in range(self.limit)]
+        self.b: list[float] = list()
+        self.basis: list[int] = list()
+
+        for r, (coefficients, b, ub) in enumerate(rows):
+            sign = -1.0 if b < 0 else 1.0
+            for j, a in coefficients.items():
+                if j < 0 or j >= self.n:
+                    raise ValueError(f"Row {r} refers to unknown variable {j}")
+                if a != 0:
+                    columns[j][r] = sign * float(a)
+            if ub:
+                columns[self.n + r][r] = sign
+            self.b.append(sign * b)
+            if ub and b >= 0:
+                self.basis.append(self.n + r)
+            else:
+                self.basis.append(len(columns))
+                columns.append({r: 1.0})
+        self.n_artificial = len(columns) - self.limit
+        self.columns = [(list(column), list(column.values())) for column in columns]
+
+        # degenerate problems, such as those with a right hand side of zeros, make
+        # the simplex stall. When starting from the slacks, the right hand side is
+        # perturbed a little and the exact solution recomputed from the final basis.
+        self.b_ub: Optional[list[float]] = None
+        if self.n_artificial == 0 and self.n_ub > 0:
+            self.b_ub = list(self.b)
+            scale = max(1.0, max(abs(b) for b in self.b_ub))
+            for r in range(len(self.b)):
+                self.b[r] += scale * PERTURBATION * (1 + r / self.n_ub)
+
+        # the starting basis of slacks and artificials is the identity
+        self.kernel: list[tuple[int, float, list[int], list[float]]] = list()
+        self.border: list[tuple[int, list[int], list[float]]] = list()
+        self.etas: list[tuple[int, float, list[int], list[float]]] = list()
+        self.refactored = 0
+        self.values = list(self.b)
+        self.costs: list[float] = []
+
+    def _ftran(self, j: int) -> list[float]:
+        """
+        the column j in terms of the basis, B^-1 * A_j
+        """
+        x = [0.0] * len(self.b)
+        for i, a in zip(*self.columns[j]):
+            x[i] = a
+        return self._apply(x)
+
+    def _apply(self, x: list[float]) -> list[float]:
+        """
+        the vector in terms of the basis, B^-1 * x, overwriting x
+        """
+        _forward(self.kernel, x)
+        for r, indices, coefficients in self.border:
+            xr = x[r]
+            if xr:
+                for i, a in zip(indices, coefficients):
+                    x[i] -= a * xr
+        return _forward(self.etas, x)
+
+    def _btran(self, y: list[float]) -> list[float]:
+        """
+        the row vector times the inverse of the basis, y * B^-1
+        """
+        y = _backward(self.etas, list(y))
+        for r, indices, coefficients in self.border:
+            y[r] -= sum(map(mul, map(y.__getitem__, indices), coefficients))
+        return _backward(self.kernel, y)
+
+    def _price(self, prices: list[float], j: int) -> float:
+        """
+        prices times the column j
+        """
+        indices, coefficients = self.columns[j]
+        return sum(map(mul, map(prices.__getitem__, indices), coefficients))
+
+    def _pivot(self, r: int, column: int, alpha: list[float]) -> None:
+        """
+        replaces the column basic in row r, where alpha is the entering column in
+        terms of the basis
+        """
+        indices = [i for i, a in enumerate(alpha) if a != 0 and i != r]
+        self.etas.append((r, alpha[r], indices, [alpha[i] for i in indices]))
+        self.basis[r] = column
+        if len(self.etas) >= REFACTOR:
+            self._refactor()
+
+    def _refactor(self) -> None:
+        """
+        rebuilds the factors of the basis, a slack or artificial variable with a
+        coefficient of one stays in its row, the other columns go where they have a large
+        coefficient in few of the columns among the rows left
+        """
+        basic = list(self.basis)
+        self.kernel = list()
+        self.border = list()
+        self.etas = list()
+        self.basis = [-1] * len(self.b)
+        others = list()
+        for column in basic:
+            indices, coefficients = self.columns[column]
+            if column >= self.n and coefficients == [1.0] and self.basis[indices[0]] == -1:
+                self.basis[indices[0]] = column
+            else:
+                others.append(column)
+        kernel = [b == -1 for b in self.basis]
+        counts = [0] * len(self.b)
+        for column in others:
+            for i in self.columns[column][0]:
+                counts[i] += 1
+        others.sort(key=lambda column: len(self.columns[column][0]))
+        for column in others:
+            alpha = [0.0] * len(self.b)
+            for i, a in zip(*self.columns[column]):
+                if kernel[i]:
+                    alpha[i] = a
+            _forward(self.kernel, alpha)
+            free = [i for i, a in enumerate(alpha) if a != 0 and self.basis[i] == -1]
+            largest = max(abs(alpha[i]) for i in free)
+            r = min(
+                (i for i in free if abs(alpha[i]) >= 0.1 * largest),
+                key=lambda i: (counts[i], -abs(alpha[i])),
+            )
+            indices = [i for i, a in enumerate(alpha) if a != 0 and i != r]
+            self.kernel.append((r, alpha[r], indices, [alpha[i] for i in indices]))
+            self.basis[r] = column
+            border = [(i, a) for i, a in zip(*self.columns[column]) if not kernel[i]]
+            if border:
+                self.border.append((r, [i for i, _ in border], [a for _, a in border]))
+        self.refactored += 1
+        self.values = self._apply(list(self.b))
+
+    def _prices(self) -> list[float]:
+        return self._btran(
+            [self.costs[j] if j < len(self.costs) else 0.0 for j in self.basis]
+        )
+
+    def _reduced_costs(self, costs: list[float]) -> list[float]:
+        prices = self._prices()
+        return [cost - self._price(prices, j) for j, cost in enumerate(costs)]
+
+    def _iterate(self, columns: int) -> None:
+        """
+        pivots until no reduced cost among the first columns is positive, using the
+        devex estimate of the steepest edge and falling back to Bland's rule when
+        stalling
+
+        The reduced costs and the devex weights are updated with the row of the pivot,
+        which costs one more pass over the columns but saves many of the pivots of
+        choosing the largest reduced cost.
+        """
+        eps = self.eps
+        costs = self.costs + [0.0] * (columns - len(self.costs))
+        reduced = self._reduced_costs(costs)
+        weights = [1.0] * columns
+        refactored = self.refactored
+        degenerate = 0
+        for _ in range(self.max_iterations):
+            if refactored != self.refactored:
+                # recomputed after every refactoring against rounding errors
+                reduced = self._reduced_costs(costs)
+                refactored = self.refactored
+            basic = set(self.basis)
+            column = None
+            best = 0.0
+            for j in range(columns):
+                d = reduced[j]
+                if d > eps and j not in basic:
+                    if degenerate > 50:
+                        column = j
+                        break
+                    if d * d > best * weights[j]:
+                        column = j
+                        best = d * d / weights[j]
+            if column is None:
+                fresh = self._reduced_costs(costs)
+                if all(d <= eps or j in basic for j, d in enumerate(fresh)):
+                    return
+                reduced = fresh
+                continue
+
+            alpha = self._ftran(column)
+            r = None
+            best = None
+            for i, a in enumerate(alpha):
+                if a > eps:
+                    ratio = self.values[i] / a
+                    if best is None or ratio < best or (
+                        ratio == best and self.basis[i] < self.basis[r]
+                    ):
+                        best = ratio
+                        r = i
+            if r is None:
+                raise ValueError("Linear program is unbounded")
+            degenerate = degenerate + 1 if best <= eps else 0
+
+            unit = [0.0] * len(self.b)
+            unit[r] = 1.0
+            row = self._btran(unit)
+            pivot = alpha[r]
+            step = reduced[column] / pivot
+            weight = weights[column]
+            leaving = self.basis[r]
+            for j in range(columns):
+                if j in basic and j != leaving:
+                    continue
+                a = self._price(row, j)
+                if a:
+                    reduced[j] -= step * a
+                    ratio = a / pivot
+                    weights[j] = max(weights[j], ratio * ratio * weight)
+            reduced[column] = 0.0
+            if leaving < columns:
+                weights[leaving] = max(weight / (pivot * pivot), 1.0)
+
+            self.values = [v - best * a for v, a in zip(self.values, alpha)]
+            self.values[r] = best
+            self._pivot(r, column, alpha)
+        raise ValueError("Linear program did not converge")
+
+    def phase_one(self) -> None:
+        """
+        minimises the sum of the artificial variables to find a feasible basis
+        """
+        if self.n_artificial > 0:
+            self.costs = [0.0] * self.limit + [-1.0] * self.n_artificial
+            self._iterate(len(self.columns))
+            infeasibility = sum(v for v, j in zip(self.values, self.basis) if j >= self.limit)
+            if infeasibility > self.eps * max(1, len(self.b)):
+                raise ValueError("Linear program is infeasible")
+        self._drop_artificials()
+
+    def _drop_artificials(self) -> None:
+        """
+        pivots remaining artificial variables out of the basis. Where this is impossible
+        the row is redundant, its artificial variable stays basic at zero and never
+        leaves, as no other column has a coefficient in its row.
+        """
+        for r, j in enumerate(self.basis):
+            if j >= self.limit:
+                unit = [0.0] * len(self.b)
+                unit[r] = 1.0
+                row = self._btran(unit)
+                basic = set(self.basis)
+                coefficient, column = max(
+                    (
+                        (abs(self._price(row, k)), k)
+                        for k in range(self.limit)
+                        if k not in basic
+                    ),
+                    default=(0.0, None),
+                )
+                if column is not None and coefficient > self.eps:
+                    self._pivot(r, column, self._ftran(column))
+        self.values = self._apply(list(self.b))
+        self.costs = []
+
+    def warm_start(self, basis: list[int]) -> bool:
+        """
+        pivots the given columns into the basis, returns whether the basis is feasible
+        """
+        wanted = [j for j in dict.fromkeys(basis) if 0 <= j < self.limit]
+        for column in wanted:
+            if column in self.basis:
+                continue
+            alpha = self._ftran(column)
+            candidates = [
+                i
+                for i, a in enumerate(alpha)
+                if self.basis[i] not in wanted and abs(a) > self.eps
+            ]
+            if not candidates:
+                return False
+            self._pivot(max(candidates, key=lambda i: abs(alpha[i])), column, alpha)
+        self.values = self._apply(list(self.b))
+        for v, j in zip(self.values, self.basis):
+            if v < -self.eps or (j >= self.limit and abs(v) > self.eps):
+                return False
+        self._drop_artificials()
+        return True
+
+    def phase_two(self) -> None:
+        self.costs = self.c
+        self._iterate(self.limit)
+
+    def result(self) -> LPResult:
+        if self.b_ub is not None:
+            self.values = self._apply(list(self.b_ub))
+        x = [0.0] * self.n
+        for v, j in zip(self.values, self.basis):
+            if j < self.n:
+                x[j] = max(v, 0.0)
+        value = sum(c * v for c, v in zip(self.c, x))
+        prices = self._prices()
+        duals = [self._price(prices, self.n + r) for r in range(self.n_ub)]
+        basis = [j for j in self.basis if j < self.limit]
+        return LPResult(x, value, basis, duals)
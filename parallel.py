@@ -0,0 +1,159 @@
+"""
+Dominance and pure Nash equilibria of large games on several cores.
+
+The comparisons of one strategy against all others, and the best responses
+against one strategy of the other player, do not depend on each other. They are
+split into shards of consecutive strategies, computed by a pool of workers, and
+merged in the order of the shards, so the results come out exactly as from the
+serial methods of DefaultPlayer and Game.
+
+The kernels are plain Python, so a thread pool only helps on an interpreter
+without the global interpreter lock. A process pool gets the payoffs once per
+worker and works on all cores.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import ge, gt, le, lt
+from typing import Callable, Optional
+
+from game import DefaultPlayer, Game, Strategy
+
+# how the strategy under test compares to another one in every payoff, see
+# the dominance methods of DefaultPlayer
+DOMINANCE = {
+    "strictly_dominated": lt,
+    "weakly_dominated": le,
+    "strictly_dominant": gt,
+    "weakly_dominant": ge,
+}
+
+POOLS = ("process", "thread")
+
+# the payoffs of the game in a process of the pool
+_shared: Optional[list[list[float]]] = None
+
+
+def dominance(
+    player: DefaultPlayer,
+    kind: str,
+    workers: Optional[int] = None,
+    pool: str = "process",
+    shard_size: int = 64,
+) -> list[Strategy]:
+    """
+    the strategies of the player with the given kind of dominance, the same as
+    calling for example player.strictly_dominated_strategy()
+
+    :param kind: one of strictly_dominated, weakly_dominated, strictly_dominant or
+        weakly_dominant
+    :param workers: the number of workers, 1 computes in this process and None uses
+        one per CPU
+    :param pool: either process or thread
+    :param shard_size: the number of strategies under test handed to a worker at once
+    """
+    if kind not in DOMINANCE:
+        raise ValueError(f"Unknown kind of dominance: {kind}")
+    strategy_set = player.strategy_set
+    if len(strategy_set) < 2:
+        return []
+
+    payoffs = [list(strategy.payoffs) for strategy in strategy_set]
+    shards = [
+        (DOMINANCE[kind], range(k, min(k + shard_size, len(payoffs))))
+        for k in range(0, len(payoffs), shard_size)
+    ]
+    found = _run(_dominance_kernel, payoffs, shards, workers, pool)
+    return [strategy_set[s] for shard in found for s in shard]
+
+
+def pure_nash_equilibria(
+    game: Game,
+    workers: Optional[int] = None,
+    pool: str = "process",
+    shard_size: int = 64,
+) -> list[tuple[Strategy, Strategy]]:
+    """
+    the pure Nash equilibria in the order of Game.pure_nash_equilibrium, without
+    printing the best responses
+
+    :param workers: the number of workers, 1 computes in this process and None uses
+        one per CPU
+    :param pool: either process or thread
+    :param shard_size: the number of strategies of the other player handed to a worker
+        at once
+    """
+    player_payoffs, opponent_payoffs = game.payoff_matrices()
+    # player_best[o] holds the best responses of the player to the opponents strategy o
+    player_best = _best_responses(player_payoffs, workers, pool, shard_size)
+    opponent_best = _best_responses(opponent_payoffs, workers, pool, shard_size)
+
+    player_strategy_set = game.player.strategy_set
+    opponent_strategy_set = game.opponent.strategy_set
+    return [
+        (player_strategy_set[p], opponent_strategy_set[o])
+        for p in range(len(player_strategy_set))
+        for o in sorted(opponent_best[p])
+        if p in player_best[o]
+    ]
+
+
+def _best_responses(
+    payoffs: list[list[float]], workers: Optional[int], pool: str, shard_size: int
+) -> list[set[int]]:
+    others = len(payoffs[0]) if payoffs else 0
+    shards = [
+        (range(k, min(k + shard_size, others)),) for k in range(0, others, shard_size)
+    ]
+    found = _run(_best_response_kernel, payoffs, shards, workers, pool)
+    return [best for shard in found for best in shard]
+
+
+def _dominance_kernel(
+    payoffs: list[list[float]], compare: Callable[[float, float], bool], under_test: range
+) -> list[int]:
+    found = list()
+    for s in under_test:
+        row = payoffs[s]
+        for k, other in enumerate(payoffs):
+            if k != s and all(map(compare, row, other)):
+                found.append(s)
+                break
+    return found
+
+
+def _best_response_kernel(payoffs: list[list[float]], others: range) -> list[set[int]]:
+    best = list()
+    for k in others:
+        column = [row[k] for row in payoffs]
+        biggest = max(column)
+        best.append({s for s, payoff in enumerate(column) if payoff == biggest})
+    return best
+
+
+def _run(kernel, payoffs: list[list[float]], shards: list[tuple], workers, pool: str) -> list:
+    """
+    applies the kernel to every shard, returning the results in the order of the shards
+    """
+    if pool not in POOLS:
+        raise ValueError(f"Unknown pool: {pool}")
+    if workers == 1 or len(shards) < 2:
+        return [kernel(payoffs, *shard) for shard in shards]
+
+    if pool == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda shard: kernel(payoffs, *shard), shards))
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_share, initargs=(payoffs,)
+    ) as executor:
+        return list(executor.map(_call_shared, [(kernel, shard) for shard in shards]))
+
+
+def _share(payoffs: list[list[float]]) -> None:
+    global _shared
+    _shared = payoffs
+
+
+def _call_shared(job):
+    kernel, shard = job
+    return kernel(_shared, *shard)
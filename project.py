@@ -5,6 +5,8 @@ import configparser
 import argparse
 
 use_weakly = False
+# lambda times the spread of the payoffs used to approximate a mixed NE
+QRE_PRECISION = 200
 PATH = os.path.dirname("games")
 
 
@@ -110,12 +112,15 @@ def main():
 
     print()
     print("Looking for mixed NE ...")
-    try:
-        player_mix: list[float] = game.mixed_nash_equilibrium(game.player)
-        opponent_mix: list[float] = game.mixed_nash_equilibrium(game.opponent)
-    except ValueError as ve:
-        print(ve)
-        exit(0)
+    if game.player.strategy_set_size() == 1 or game.opponent.strategy_set_size() == 1:
+        player_mix, opponent_mix = single_strategy_mix(game)
+    else:
+        try:
+            player_mix: list[float] = game.mixed_nash_equilibrium(game.player)
+            opponent_mix: list[float] = game.mixed_nash_equilibrium(game.opponent)
+        except ValueError as ve:
+            print(ve)
+            player_mix, opponent_mix = quantal_response_mix(game)
 
     if len(player_mix) > 0 and len(opponent_mix) > 0:
         print(f"Mix for player")
@@ -128,10 +133,53 @@ def main():
             print(
                 f"   {game.opponent} should mix {game.opponent.strategy(j)} with {opponent_mix[j]:.0%}"
             )
+        try:
+            score = game.score_profiles([(player_mix, opponent_mix)])[0]
+            print(
+                f"Regret of player {score.player_regret:.4g} and opponent {score.opponent_regret:.4g}, "
+                f"epsilon = {score.epsilon:.4g}"
+            )
+        except ValueError as ve:
+            print(f"Mix could not be verified: {ve}")
     else:
         print("... no mixed strategies identified")
 
 
+def single_strategy_mix(game: Game) -> tuple[list[float], list[float]]:
+    """
+    once a player is left with a single strategy, there is nothing to mix: the other
+    player plays his/her first best response to it
+    """
+    player_size = game.player.strategy_set_size()
+    opponent_size = game.opponent.strategy_set_size()
+    if player_size == 1:
+        print(f"... {game.player} has a single strategy left, {game.opponent} best responds")
+        best = game.best_response.best_responses(game.opponent, 0)[0]
+        return [1.0], [1.0 if o == best else 0.0 for o in range(opponent_size)]
+    print(f"... {game.opponent} has a single strategy left, {game.player} best responds")
+    best = game.best_response.best_responses(game.player, 0)[0]
+    return [1.0 if p == best else 0.0 for p in range(player_size)], [1.0]
+
+
+def quantal_response_mix(game: Game) -> tuple[list[float], list[float]]:
+    """
+    approximates a mixed NE by the logit quantal response equilibrium for a lambda
+    large compared to the spread of the payoffs
+    """
+    player_payoffs, opponent_payoffs = game.payoff_matrices()
+    payoffs = [payoff for row in player_payoffs + opponent_payoffs for payoff in row]
+    spread = max(payoffs) - min(payoffs) if len(payoffs) > 0 else 0
+    lam = QRE_PRECISION / spread if spread > 0 else 0
+
+    print(f"... approximating by the logit quantal response equilibrium at lambda = {lam:.4g}")
+    try:
+        qre = game.quantal_response_equilibrium([lam])[0]
+    except ValueError as ve:
+        print(ve)
+        exit(0)
+    return qre.player, qre.opponent
+
+
 def game_setup() -> Game:
     parser = argparse.ArgumentParser(description="Solve payoff matrices")
     parser.add_argument(
@@ -156,20 +204,35 @@ def game_setup() -> Game:
             dataset = config.read(os.path.join(".", args.c))
             if len(dataset) != 1:
                 exit(f"{args.c} could not be found")
+            # the payoffs of the default game must not stand in for a tree or a typo
+            own = configparser.ConfigParser()
+            own.read(os.path.join(".", args.c))
+            if not own.has_section("payoffs"):
+                exit(f"{args.c} holds no [payoffs] section")
 
-        # init player
-        player_payoffs = config.get("payoffs", "player")
-        player_name = config.get("names", "player")
-        player = Player(player_name, player_payoffs)
-
-        # init opponent
-        opponent_payoffs = config.get("payoffs", "opponent")
-        opponent_name = config.get("names", "opponent")
-        opponent = Opponent(opponent_name, opponent_payoffs)
+        game = game_from_config(config)
 
     except BaseException as be:
         exit(be)
 
+    return game
+
+
+def game_from_config(config: configparser.ConfigParser) -> Game:
+    """
+    initialises the players and the game from the names and payoffs sections
+    of an already read configuration
+    """
+    # init player
+    player_payoffs = config.get("payoffs", "player")
+    player_name = config.get("names", "player")
+    player = Player(player_name, player_payoffs)
+
+    # init opponent
+    opponent_payoffs = config.get("payoffs", "opponent")
+    opponent_name = config.get("names", "opponent")
+    opponent = Opponent(opponent_name, opponent_payoffs)
+
     # init the game
     return Game(player, opponent)
 
@@ -0,0 +1,220 @@
+"""
+Logit quantal response equilibria of two player games.
+
+Each player chooses a strategy with a probability proportional to
+exp(lambda * expected payoff). At lambda = 0 both players mix uniformly, and
+with lambda growing the equilibria approach a Nash equilibrium. This module
+traces that branch with a predictor-corrector continuation, see
+McKelvey and Palfrey (1995) and Turocy (2005).
+
+The probabilities are followed as logarithms, so strategies that are hardly
+ever played do not run into underflow for large lambda.
+"""
+
+from math import exp, log
+from typing import NamedTuple
+
+from linalg import dot, norm, solve
+
+
+class QREPoint(NamedTuple):
+    """
+    a point on the logit equilibrium branch
+    """
+
+    lam: float
+    player: list[float]
+    opponent: list[float]
+
+
+def logit_qre_path(
+    player_payoffs: list[list[float]],
+    opponent_payoffs: list[list[float]],
+    lambdas: list[float],
+    step: float = 0.1,
+    max_step: float = 10.0,
+    tol: float = 1e-10,
+    max_steps: int = 100000,
+) -> list[QREPoint]:
+    """
+    traces the principal branch of the logit QRE from lambda = 0 and returns the
+    equilibria at the requested values of lambda
+
+    :param player_payoffs: player_payoffs[p][o] is the players payoff for his/her
+        strategy p against the opponents strategy o
+    :param opponent_payoffs: opponent_payoffs[o][p] is the opponents payoff, the same
+        layout as the payoffs of the strategies of the opponent
+    :param lambdas: the non negative values of lambda to return the equilibria for
+    :param step: the initial step length along the branch
+    :raise: ValueError when the branch could not be followed up to the largest lambda
+    :return: one point per requested lambda, in the order of the request
+    :rtype: list[QREPoint]
+    """
+    if any(lam < 0 for lam in lambdas):
+        raise ValueError("Lambda must not be negative")
+
+    system = _LogitSystem(player_payoffs, opponent_payoffs)
+    size = system.size
+
+    targets = sorted(set(lambdas))
+    found: dict[float, list[float]] = {}
+
+    # at lambda = 0 both players mix uniformly
+    z = [-log(system.m)] * system.m + [-log(system.n)] * system.n + [0.0]
+    while targets and targets[0] == 0:
+        found[targets.pop(0)] = z
+    tangent = [0.0] * size + [1.0]
+
+    steps = 0
+    h = step
+    while targets:
+        steps += 1
+        if steps > max_steps:
+            raise ValueError(f"Could not follow the branch up to lambda = {targets[-1]}")
+
+        tangent = _tangent(system.jacobian(z), tangent)
+
+        # predictor along the tangent, followed by newton steps perpendicular to it
+        predicted = [a + h * t for a, t in zip(z, tangent)]
+        corrected = _correct(system, predicted, tangent, tol)
+        if corrected is None:
+            h /= 2
+            if h < 1e-12:
+                raise ValueError(f"Step size vanished at lambda = {z[-1]}")
+            continue
+
+        # collect the requested lambdas passed by this step
+        while targets and z[-1] < targets[0] <= corrected[-1]:
+            lam = targets.pop(0)
+            share = (lam - z[-1]) / (corrected[-1] - z[-1])
+            guess = [a + share * (b - a) for a, b in zip(z, corrected)]
+            found[lam] = _correct_at(system, guess, lam, tol)
+
+        z = corrected
+        h = min(h * 1.5, max_step)
+
+    points = list()
+    for lam in lambdas:
+        z = found[lam]
+        points.append(
+            QREPoint(
+                lam,
+                [exp(b) for b in z[: system.m]],
+                [exp(g) for g in z[system.m : size]],
+            )
+        )
+    return points
+
+
+class _LogitSystem:
+    """
+    the equations of the logit equilibrium in the unknowns (log x, log y, lambda)
+
+        log x_i - log x_0 - lambda * (U_i - U_0) = 0   for i > 0
+        sum(x) - 1 = 0
+    and the same for the opponent, where U = A y are the players expected payoffs
+    """
+
+    def __init__(self, player_payoffs, opponent_payoffs):
+        self.a = [list(map(float, row)) for row in player_payoffs]
+        self.b = [list(map(float, row)) for row in opponent_payoffs]
+        self.m = len(self.a)
+        self.n = len(self.b)
+        if self.m == 0 or self.n == 0:
+            raise ValueError("Both players need at least one strategy")
+        if any(len(row) != self.n for row in self.a) or any(
+            len(row) != self.m for row in self.b
+        ):
+            raise ValueError("Payoffs do not match the number of strategies")
+        self.size = self.m + self.n
+        # differences to the first strategy, as all equations are relative to it
+        self.da = [[aij - a0j for aij, a0j in zip(row, self.a[0])] for row in self.a]
+        self.db = [[bji - b0i for bji, b0i in zip(row, self.b[0])] for row in self.b]
+
+    def _split(self, z):
+        x = [exp(b) for b in z[: self.m]]
+        y = [exp(g) for g in z[self.m : self.size]]
+        return x, y, z[-1]
+
+    def values(self, z: list[float]) -> list[float]:
+        x, y, lam = self._split(z)
+        beta = z[: self.m]
+        gamma = z[self.m : self.size]
+        h = [
+            beta[i] - beta[0] - lam * dot(self.da[i], y) for i in range(1, self.m)
+        ]
+        h.append(sum(x) - 1)
+        h += [
+            gamma[j] - gamma[0] - lam * dot(self.db[j], x) for j in range(1, self.n)
+        ]
+        h.append(sum(y) - 1)
+        return h
+
+    def jacobian(self, z: list[float]) -> list[list[float]]:
+        """
+        returns the size x (size + 1) matrix of the derivatives of the equations
+        """
+        x, y, lam = self._split(z)
+        m, n = self.m, self.n
+        rows = list()
+        for i in range(1, m):
+            row = [0.0] * (self.size + 1)
+            row[0] = -1.0
+            row[i] = 1.0
+            for j in range(n):
+                row[m + j] = -lam * self.da[i][j] * y[j]
+            row[-1] = -dot(self.da[i], y)
+            rows.append(row)
+        rows.append(x + [0.0] * n + [0.0])
+        for j in range(1, n):
+            row = [0.0] * (self.size + 1)
+            for i in range(m):
+                row[i] = -lam * self.db[j][i] * x[i]
+            row[m] = -1.0
+            row[m + j] = 1.0
+            row[-1] = -dot(self.db[j], x)
+            rows.append(row)
+        rows.append([0.0] * m + y + [0.0])
+        return rows
+
+
+def _tangent(jacobian: list[list[float]], previous: list[float]) -> list[float]:
+    """
+    returns the unit vector spanning the null space of the jacobian, oriented like
+    the previous tangent so the branch is not followed backwards
+    """
+    tangent = solve(jacobian + [previous], [0.0] * len(jacobian) + [1.0])
+    length = norm(tangent)
+    return [t / length for t in tangent]
+
+
+def _correct(system, z, tangent, tol, iterations=10):
+    """
+    newton steps perpendicular to the tangent, returns None if they do not converge
+    so the caller can retry with a shorter step
+    """
+    try:
+        for _ in range(iterations):
+            h = system.values(z)
+            delta = solve(system.jacobian(z) + [tangent], [-v for v in h] + [0.0])
+            z = [a + d for a, d in zip(z, delta)]
+            if norm(delta) < tol:
+                return z
+        return z if norm(system.values(z)) < tol ** 0.5 else None
+    except (ValueError, OverflowError):
+        return None
+
+
+def _correct_at(system, z, lam, tol, iterations=20):
+    """
+    newton steps with lambda held fixed, for the requested points of the branch
+    """
+    z = z[:-1] + [lam]
+    for _ in range(iterations):
+        h = system.values(z)
+        jacobian = [row[:-1] for row in system.jacobian(z)]
+        delta = solve(jacobian, [-v for v in h])
+        z = [a + d for a, d in zip(z[:-1], delta)] + [lam]
+        if norm(delta) < tol:
+            break
+    return z
@@ -0,0 +1,155 @@
+"""
+Rendering of payoff matrices and best response grids.
+
+The tables are written row by row to a file handle, so even large games never
+have to be held in memory as formatted strings. Only the grid format needs to
+know the column widths up front, for that the rows are formatted twice rather
+than being kept around.
+"""
+
+import csv
+from html import escape
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from tabulate import tabulate  # table pretty
+
+FORMATS = ("grid", "csv", "html", "summary")
+
+# same padding tabulate adds to the headers of a grid
+HEADER_PADDING = 2
+
+
+def payoff_cell(player, opponent, p: int, o: int) -> str:
+    """
+    returns the cell of the payoff matrix at row p and column o
+    """
+    return f"({player.strategy(p).payoff(o)} | {opponent.strategy(o).payoff(p)})"
+
+
+def write_table(
+    stream: TextIO,
+    header: list[str],
+    rows: Callable[[], Iterator[list[str]]],
+    fmt: str = "grid",
+    chunk_size: int = 256,
+) -> None:
+    """
+    writes a table to the stream, chunk_size rows at a time
+
+    :param header: the names of the columns, not including the column holding the row names
+    :param rows: returns a fresh iterator over the rows, each starting with the row name,
+        the grid format calls it twice
+    :param fmt: one of grid, csv or html
+    """
+    if fmt == "grid":
+        _write_grid(stream, header, rows, chunk_size)
+    elif fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow([""] + header)
+        for chunk in _chunks(rows(), chunk_size):
+            writer.writerows(chunk)
+    elif fmt == "html":
+        stream.write("<table>\n<thead>\n<tr><th></th>")
+        stream.write("".join(f"<th>{escape(h)}</th>" for h in header))
+        stream.write("</tr>\n</thead>\n<tbody>\n")
+        for chunk in _chunks(rows(), chunk_size):
+            stream.write(
+                "".join(
+                    f"<tr><th>{escape(row[0])}</th>"
+                    + "".join(f"<td>{escape(cell)}</td>" for cell in row[1:])
+                    + "</tr>\n"
+                    for row in chunk
+                )
+            )
+        stream.write("</tbody>\n</table>\n")
+    else:
+        raise ValueError(f"Unknown format {fmt}, use one of {', '.join(FORMATS)}")
+
+
+def write_summary(
+    stream: TextIO,
+    header: list[str],
+    row_count: int,
+    row: Callable[[int, list[int]], list[str]],
+    max_rows: int = 20,
+    max_columns: int = 10,
+) -> None:
+    """
+    writes a grid showing only the first and the last rows and columns, the skipped
+    ones are marked by '...'. Games fitting the limits are shown completely.
+
+    :param row: returns the row name followed by the cells of the given columns
+    """
+    rows = _truncated(row_count, max_rows)
+    columns = _truncated(len(header), max_columns)
+
+    summary_header = [header[c] if c is not None else "..." for c in columns]
+    kept_columns = [c for c in columns if c is not None]
+
+    data = list()
+    for r in rows:
+        if r is None:
+            data.append(["..."] * (len(columns) + 1))
+            continue
+        cells = iter(row(r, kept_columns))
+        line = [next(cells)]
+        for c in columns:
+            line.append(next(cells) if c is not None else "...")
+        data.append(line)
+
+    stream.write(tabulate(data, summary_header, tablefmt="grid", stralign="center"))
+    stream.write("\n")
+    if row_count > max_rows or len(header) > max_columns:
+        stream.write(f"({row_count} rows x {len(header)} columns)\n")
+
+
+def _truncated(size: int, limit: int) -> list[Optional[int]]:
+    """
+    returns all indices up to size, or the first and last ones with None in between
+    """
+    if size <= limit:
+        return list(range(size))
+    head = (limit + 1) // 2
+    tail = limit - head
+    return list(range(head)) + [None] + list(range(size - tail, size))
+
+
+def _chunks(rows: Iterable[list[str]], chunk_size: int) -> Iterator[list[list[str]]]:
+    chunk = list()
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = list()
+    if chunk:
+        yield chunk
+
+
+def _write_grid(
+    stream: TextIO,
+    header: list[str],
+    rows: Callable[[], Iterator[list[str]]],
+    chunk_size: int,
+) -> None:
+    # first pass, only the widths are kept
+    widths = [HEADER_PADDING] + [len(h) + HEADER_PADDING for h in header]
+    for row in rows():
+        for c, cell in enumerate(row):
+            if len(cell) > widths[c]:
+                widths[c] = len(cell)
+
+    separator = "+" + "+".join("-" * (w + 2) for w in widths) + "+\n"
+
+    def line(cells: list[str]) -> str:
+        return (
+            "| "
+            + " | ".join(f"{cell:^{widths[c]}}" for c, cell in enumerate(cells))
+            + " |\n"
+        )
+
+    stream.write(separator)
+    stream.write(line([""] + header))
+    stream.write(separator.replace("-", "="))
+    # second pass, writing chunk_size rows at once
+    for chunk in _chunks(rows(), chunk_size):
+        stream.write("".join(line(row) + separator for row in chunk))
@@ -0,0 +1,370 @@
+"""
+A long running local service solving payoff matrices.
+
+Rather than starting a new process for every game, the service keeps a pool of
+worker processes with the solvers already imported. Requests are read as JSON
+lines from a unix socket or a localhost port, queued and handed to the workers
+in small batches, and every result is written back as a JSON line as soon as
+its batch is done.
+
+A request holds an id and either the text of an *.ini file or the game itself:
+
+    {"id": 1, "ini": "[payoffs]\\nplayer = (1, 1), (0, 0)\\nopponent = (0, 0), (2, 2)"}
+    {"id": 2, "game": {"payoffs": {"player": "(1, 1), (0, 0)", "opponent": "(0, 0), (2, 2)"}},
+     "analyses": ["pure_nash"], "use_weakly": true}
+    {"id": 3, "game": {"payoffs": {"player": [[1, 1], [0, 0]], "opponent": [[0, 0], [2, 2]]}}}
+
+Missing sections are taken from games/default.ini, which is read once on start.
+"""
+
+import argparse
+import asyncio
+import configparser
+import contextlib
+import io
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+from game import Game
+from project import game_from_config
+
+ANALYSES = ("dominance", "pure_nash", "iterated_deletion", "mixed")
+
+# the longest request line accepted, the payoffs of large games take a lot of text
+LINE_LIMIT = 64 * 1024 * 1024
+
+_defaults: dict = {}
+
+
+def read_defaults(
+    path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games", "default.ini")
+) -> dict:
+    """
+    reads the default configuration into a plain dict, so it can be handed to the workers
+    """
+    config = configparser.ConfigParser()
+    config.read(path)
+    return {section: dict(config[section]) for section in config.sections()}
+
+
+def init_worker(defaults: dict) -> None:
+    """
+    initialiser of the worker processes, keeps the defaults around for all requests
+    """
+    global _defaults
+    _defaults = defaults
+
+
+def game_from_request(request: dict) -> Game:
+    """
+    builds the game of a request, either from the ini text or from the game dict
+    """
+    config = configparser.ConfigParser()
+    config.read_dict(_defaults)
+    if "ini" in request:
+        config.read_string(request["ini"])
+    elif "game" in request:
+        game = request["game"]
+        if not isinstance(game, dict):
+            raise ValueError("'game' needs to be a JSON object")
+        config.read_dict(
+            {
+                section: (
+                    {key: payoffs_str(key, value) for key, value in values.items()}
+                    if section == "payoffs" and isinstance(values, dict)
+                    else values
+                )
+                for section, values in game.items()
+            }
+        )
+    else:
+        raise ValueError("request needs to hold either 'ini' or 'game'")
+    return game_from_config(config)
+
+
+def payoffs_str(key: str, payoffs) -> str:
+    """
+    turns the payoffs of a player given as list of strategies, each a list of numbers,
+    into the format of the *.ini files, strings are taken as they are
+    """
+    if isinstance(payoffs, str):
+        return payoffs
+    if (
+        isinstance(payoffs, list)
+        and len(payoffs) > 0
+        and all(isinstance(row, list) and len(row) > 0 for row in payoffs)
+        and all(
+            isinstance(p, (int, float)) and not isinstance(p, bool)
+            for row in payoffs
+            for p in row
+        )
+    ):
+        return ", ".join("(" + ", ".join(str(p) for p in row) + ")" for row in payoffs)
+    raise ValueError(
+        f"payoffs of {key} need to be a string like (1, 2), (3, 4) or a list of lists of numbers"
+    )
+
+
+def analyse(request: dict) -> dict:
+    """
+    runs the requested analyses for a single request and returns the response
+
+    The solvers print their intermediate steps, that output is captured and
+    dropped, only the results are returned.
+    """
+    response: dict = {"id": request.get("id")}
+    try:
+        analyses = request.get("analyses", ANALYSES)
+        for analysis in analyses:
+            if analysis not in ANALYSES:
+                raise ValueError(f"unknown analysis: {analysis}")
+
+        game = game_from_request(request)
+        result: dict = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            if "dominance" in analyses:
+                result["dominance"] = {
+                    str(player): {
+                        "strictly_dominated": names(player.strictly_dominated_strategy()),
+                        "weakly_dominated": names(player.weakly_dominated_strategy()),
+                    }
+                    for player in game.players
+                }
+            if "pure_nash" in analyses:
+                result["pure_nash"] = [
+                    [ne[0].name, ne[1].name] for ne in game.pure_nash_equilibrium()
+                ]
+            if "iterated_deletion" in analyses or "mixed" in analyses:
+                game.solve_by_iterated_deletion(
+                    use_weakly=request.get("use_weakly", False)
+                )
+            if "iterated_deletion" in analyses:
+                result["iterated_deletion"] = {
+                    str(player): names(player.strategy_set) for player in game.players
+                }
+            if "mixed" in analyses:
+                try:
+                    result["mixed"] = {
+                        str(player): dict(
+                            zip(
+                                names(player.strategy_set),
+                                game.mixed_nash_equilibrium(player),
+                            )
+                        )
+                        for player in game.players
+                    }
+                except (ValueError, ZeroDivisionError) as e:
+                    result["mixed"] = {"error": str(e)}
+        response["result"] = result
+    except BaseException as be:
+        response["error"] = str(be)
+    return response
+
+
+def analyse_batch(requests: list[dict]) -> list[dict]:
+    """
+    runs a batch of requests in one go, so a worker is only called once per batch
+    """
+    return [analyse(request) for request in requests]
+
+
+def names(strategy_set) -> list[str]:
+    return [strategy.name for strategy in strategy_set]
+
+
+class SolverService:
+    """
+    queues incoming requests and hands them in batches to the executor
+
+    :param executor: the pool doing the actual solving, if none is provided a
+        process pool is started
+    :param batch_size: the maximum number of requests handed to a worker at once
+    :param batch_delay: seconds to wait for further requests before a batch is sent
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+        batch_size: int = 32,
+        batch_delay: float = 0.002,
+    ):
+        self._defaults = read_defaults()
+        if executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(self._defaults,),
+            )
+        else:
+            init_worker(self._defaults)
+        self._executor = executor
+        self._batch_size = batch_size
+        self._batch_delay = batch_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._pending: set = set()
+        self._stopped = False
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+
+    async def stop(self) -> None:
+        """
+        finishes the batches already handed to the executor, requests still queued
+        are answered with an error
+        """
+        self._stopped = True
+        if self._batcher is not None:
+            self._batcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._batcher
+        if self._queue is not None:
+            while not self._queue.empty():
+                _fail([self._queue.get_nowait()], "service stopped")
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, request: dict) -> dict:
+        """
+        queues a single request and waits for its response
+        """
+        if self._stopped:
+            return {"id": request.get("id"), "error": "service stopped"}
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                # give further requests a moment to arrive, so they share the batch
+                deadline = loop.time() + self._batch_delay
+                while len(batch) < self._batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                _fail(batch, "service stopped")
+                raise
+            task = asyncio.create_task(self._solve(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _solve(self, batch: list) -> None:
+        loop = asyncio.get_running_loop()
+        requests = [request for request, _ in batch]
+        try:
+            responses = await loop.run_in_executor(
+                self._executor, analyse_batch, requests
+            )
+        except BaseException as be:
+            responses = [{"id": request.get("id"), "error": str(be)} for request in requests]
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        reads JSON lines from the connection and streams back each response once
+        it is available, hence responses might arrive in a different order
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request needs to be a JSON object")
+            except ValueError as ve:
+                response = {"id": None, "error": f"invalid request: {ve}"}
+            else:
+                response = await self.submit(request)
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # the line exceeds the limit of the reader, which can not recover
+                    async with lock:
+                        response = {"id": None, "error": "invalid request: line too long"}
+                        writer.write(json.dumps(response).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+def _fail(batch: list, error: str) -> None:
+    """
+    answers the requests of a batch which will not be solved
+    """
+    for request, future in batch:
+        if not future.done():
+            future.set_result({"id": request.get("id"), "error": error})
+
+
+async def serve(
+    socket_path: Optional[str], port: int, workers: Optional[int]
+) -> None:
+    service = SolverService(workers=workers)
+    await service.start()
+    if socket_path:
+        server = await asyncio.start_unix_server(
+            service.handle_connection, socket_path, limit=LINE_LIMIT
+        )
+        print(f"serving on {socket_path}")
+    else:
+        server = await asyncio.start_server(
+            service.handle_connection, "127.0.0.1", port, limit=LINE_LIMIT
+        )
+        print(f"serving on 127.0.0.1:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve solving payoff matrices")
+    parser.add_argument("--socket", type=str, help="path of the unix socket to listen on")
+    parser.add_argument(
+        "--port", type=int, default=8765, help="localhost port to listen on, if no socket is given"
+    )
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.socket, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
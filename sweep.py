@@ -0,0 +1,189 @@
+"""
+Sweeps over parameters of the payoffs of a game.
+
+Instead of writing an *.ini file per point of a grid, the payoffs are given as
+a template such as "(50, {x}), (90, 20)", or as a callable returning the payoffs
+for the parameters. Neighbouring points of a grid mostly share their structure,
+so each point is warm started from the previous one:
+
+* the deletion order of strictly dominated strategies is replayed and only
+  checked, rather than searched for again
+* the supports of the previous equilibrium are tried first
+* the correlated equilibrium starts from the previous basis
+
+Points where the structure, hence the remaining strategies or the supports of
+the equilibrium, changes are flagged.
+"""
+
+from itertools import product
+from typing import Callable, NamedTuple, Optional, Union
+
+from game import (
+    Game,
+    GameView,
+    Opponent,
+    Player,
+    SupportEquilibrium,
+    correlated_equilibrium,
+    support_enumeration,
+)
+from lp import LPResult
+
+Payoffs = Union[str, Callable[..., str]]
+
+
+class SweepPoint(NamedTuple):
+    """
+    the analysis of one point of the grid
+
+    player and opponent hold the names of the strategies surviving the iterated
+    deletion of strictly dominated strategies, the equilibria refer to the indices
+    within those lists
+    """
+
+    parameters: dict[str, float]
+    player: list[str]
+    opponent: list[str]
+    equilibrium: Optional[SupportEquilibrium]
+    correlated: Optional[LPResult]
+    changed: bool
+
+
+def sweep(
+    player_payoffs: Payoffs,
+    opponent_payoffs: Payoffs,
+    parameters: dict[str, list[float]],
+    names: tuple[str, str] = ("P", "O"),
+    correlated: bool = False,
+) -> list[SweepPoint]:
+    """
+    analyses the game at every point of the grid spanned by the parameters
+
+    :param player_payoffs: the payoffs of the player in the format of the *.ini files,
+        either with placeholders like {x} for the parameters or as a callable taking
+        the parameters as keyword arguments
+    :param opponent_payoffs: the payoffs of the opponent in the same way
+    :param parameters: the values to sweep for each parameter, all combinations are
+        analysed with the last parameter changing fastest
+    :param correlated: whether to solve for the welfare maximising correlated equilibrium,
+        which takes minutes per point for games beyond 20 strategies each
+    :return: one point per combination of the parameters
+    :rtype: list[SweepPoint]
+    """
+    keys = list(parameters)
+    points: list[SweepPoint] = list()
+
+    order: list[tuple[int, int]] = list()
+    guess = None
+    basis = None
+    previous = None
+
+    for values in product(*(parameters[key] for key in keys)):
+        point = dict(zip(keys, values))
+        game = Game(
+            Player(names[0], _payoffs(player_payoffs, point)),
+            Opponent(names[1], _payoffs(opponent_payoffs, point)),
+        )
+        player_matrix, opponent_matrix = game.payoff_matrices()
+
+        rows, columns, order = iterated_strict_deletion(
+            player_matrix, opponent_matrix, order
+        )
+        reduced_player = [[player_matrix[r][c] for c in columns] for r in rows]
+        reduced_opponent = [[opponent_matrix[c][r] for r in rows] for c in columns]
+
+        structure = (rows, columns)
+        if previous is not None and previous != structure:
+            # the indices of the supports and the basis refer to the previous game
+            guess = None
+            basis = None
+
+        equilibrium = support_enumeration(reduced_player, reduced_opponent, guess)
+        if equilibrium is not None:
+            guess = (equilibrium.player_support, equilibrium.opponent_support)
+
+        correlated_result = None
+        if correlated:
+            correlated_result = correlated_equilibrium(
+                reduced_player, reduced_opponent, "welfare", basis
+            )
+            basis = correlated_result.basis or None
+
+        changed = len(points) > 0 and (
+            previous != structure
+            or _supports(points[-1].equilibrium) != _supports(equilibrium)
+        )
+        points.append(
+            SweepPoint(
+                point,
+                [game.player.strategy(r).name for r in rows],
+                [game.opponent.strategy(c).name for c in columns],
+                equilibrium,
+                correlated_result,
+                changed,
+            )
+        )
+        previous = structure
+
+    return points
+
+
+def iterated_strict_deletion(
+    player_payoffs: list[list[float]],
+    opponent_payoffs: list[list[float]],
+    order: Optional[list[tuple[int, int]]] = None,
+) -> tuple[list[int], list[int], list[tuple[int, int]]]:
+    """
+    deletes strictly dominated strategies until there are none left, with the result
+    of GameView.iterated_deletion(use_weakly=False)
+
+    As the result of deleting strictly dominated strategies does not depend on the
+    order, the order of a similar game can be replayed: each step only needs to be
+    checked instead of searched for. If a step does not hold any more, the deletion
+    starts over.
+
+    :param order: the deletions of a previous run as (player index, strategy index)
+    :return: the remaining strategies of the player and the opponent, and the order
+        of the deletions
+    :rtype: tuple[list[int], list[int], list[tuple[int, int]]]
+    """
+    snapshot = GameView(
+        player_payoffs,
+        opponent_payoffs,
+        [str(p) for p in range(len(player_payoffs))],
+        [str(o) for o in range(len(opponent_payoffs))],
+    )
+    view = snapshot
+    done: list[tuple[int, int]] = list()
+
+    for side, index in order or ():
+        if index not in view.remaining(side) or not view.is_dominated(side, index):
+            view = snapshot
+            done = list()
+            break
+        view = view.remove(side, index)
+        done.append((side, index))
+
+    found = True
+    while found:
+        found = False
+        for side in range(2):
+            dominated = view.dominated(side)
+            if dominated:
+                view = view.remove(side, dominated)
+                done.extend((side, index) for index in dominated)
+                found = True
+
+    return list(view.remaining(0)), list(view.remaining(1)), done
+
+
+def _payoffs(payoffs: Payoffs, point: dict[str, float]) -> str:
+    if callable(payoffs):
+        return payoffs(**point)
+    return payoffs.format(**point)
+
+
+def _supports(equilibrium: Optional[SupportEquilibrium]):
+    if equilibrium is None:
+        return None
+    return equilibrium.player_support, equilibrium.opponent_support
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+from blockwise import (
+    PayoffMatrix,
+    best_responses,
+    dominated_strategies,
+    pure_nash_equilibria,
+    write_matrix,
+)
+from helpers import random_game
+
+
+def test_payoff_matrix(tmp_path):
+    path = str(tmp_path / "payoffs.bin")
+    assert write_matrix(path, ([r * 3 + c for c in range(3)] for r in range(4))) == 4
+
+    with PayoffMatrix(path, 3) as matrix:
+        assert (matrix.rows, matrix.columns) == (4, 3)
+        assert matrix.row(2) == [6.0, 7.0, 8.0]
+        assert matrix.tile([1, 3], 1, 3) == {1: [4.0, 5.0], 3: [10.0, 11.0]}
+        # blocks of at most 7 payoffs hold two rows
+        assert [start for start, _ in matrix.blocks(7)] == [0, 2]
+
+    with pytest.raises(ValueError):
+        PayoffMatrix(path, 5)
+
+
+def test_blockwise_analysis(tmp_path):
+    rng = random.Random(3)
+    player_path = str(tmp_path / "player.bin")
+    opponent_path = str(tmp_path / "opponent.bin")
+
+    for _ in range(20):
+        m, n = rng.randint(1, 7), rng.randint(1, 7)
+        game = random_game(rng, m, n)
+        player_payoffs, opponent_payoffs = game.payoff_matrices()
+        write_matrix(player_path, player_payoffs)
+        write_matrix(opponent_path, opponent_payoffs)
+
+        with PayoffMatrix(player_path, n) as player, PayoffMatrix(opponent_path, m) as opponent:
+            # tiny blocks and tiles, so every game is streamed in pieces
+            responses = best_responses(player, block_size=n)
+            for o in range(n):
+                assert responses.strategies[o] == game.best_response.best_responses(
+                    game.player, o
+                )
+
+            index = {s: i for i, s in enumerate(game.player.strategy_set)}
+            expected = sorted(
+                (index[p], game.opponent.strategy_set.index(o))
+                for p, o in game.pure_nash_equilibrium()
+            )
+            assert pure_nash_equilibria(player, opponent, block_size=2 * n) == expected
+
+            for weakly, found in (
+                (False, game.player.strictly_dominated_strategy()),
+                (True, game.player.weakly_dominated_strategy()),
+            ):
+                assert dominated_strategies(
+                    player, weakly, block_rows=2, block_columns=2
+                ) == sorted(index[s] for s in found)
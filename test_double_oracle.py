@@ -0,0 +1,39 @@
+import random
+
+import pytest
+from double_oracle import double_oracle
+
+
+def test_double_oracle():
+    # matching pennies
+    solution = double_oracle([[1, -1], [-1, 1]])
+    assert solution.value == pytest.approx(0)
+    assert solution.player == pytest.approx([0.5, 0.5])
+    assert solution.opponent == pytest.approx([0.5, 0.5])
+
+    # Williams, The Compleat Strategyst
+    solution = double_oracle([[3, -4, 2], [1, -7, -3], [-2, 4, 7]])
+    assert solution.value == pytest.approx(4 / 13)
+    assert solution.player_support == [0, 2]
+    assert solution.opponent_support == [0, 1]
+
+    with pytest.raises(ValueError):
+        double_oracle(lambda r, c: r - c)
+
+
+def test_double_oracle_is_equilibrium():
+    rng = random.Random(11)
+    for _ in range(20):
+        m, n = rng.randint(1, 12), rng.randint(1, 12)
+        matrix = [[rng.randint(-5, 5) for _ in range(n)] for _ in range(m)]
+        solution = double_oracle(lambda r, c: matrix[r][c], m, n)
+
+        # neither player gains by deviating
+        rows = [sum(q * a for q, a in zip(solution.opponent, row)) for row in matrix]
+        columns = [
+            sum(p * matrix[r][c] for r, p in enumerate(solution.player)) for c in range(n)
+        ]
+        assert max(rows) == pytest.approx(solution.value)
+        assert min(columns) == pytest.approx(solution.value)
+        assert sum(solution.player) == pytest.approx(1)
+        assert sum(solution.opponent) == pytest.approx(1)
@@ -0,0 +1,134 @@
+import configparser
+import os
+
+import pytest
+from extensive import Chance, Decision, ExtensiveGame, Terminal, game_from_config
+
+POKER = """
+[names]
+player = P
+opponent = O
+
+[root]
+player = chance
+actions = High: high (0.5), Low: low (0.5)
+
+[high]
+player = P
+actions = Raise: high_raised, Fold: lose_1
+
+[low]
+player = P
+actions = Raise: low_raised, Fold: lose_1
+
+[high_raised]
+player = O
+infoset = raised
+actions = Meet: win_2, Pass: win_1
+
+[low_raised]
+player = O
+infoset = raised
+actions = Meet: lose_2, Pass: win_1
+
+[win_1]
+payoffs = 1, -1
+
+[win_2]
+payoffs = 2, -2
+
+[lose_1]
+payoffs = -1, 1
+
+[lose_2]
+payoffs = -2, 2
+"""
+
+TREES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games", "trees")
+
+
+def load(text: str) -> ExtensiveGame:
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return game_from_config(config)
+
+
+def test_backward_induction():
+    with open(os.path.join(TREES, "entry.ini")) as file:
+        entry = load(file.read())
+
+    assert entry.is_perfect_information()
+    solution = entry.backward_induction()
+    assert solution.payoffs == (1, 1)
+    assert solution.actions == {"entered": "Accommodate", "root": "In"}
+
+    # a node shared by two paths is solved once and with a chance node in between
+    shared = Terminal("shared", (2, 0))
+    root = Decision(
+        "root",
+        0,
+        "root",
+        {
+            "A": Chance("coin", {"H": (0.5, shared), "T": (0.5, Terminal("t", (0, 4)))}),
+            "B": Decision("b", 1, "b", {"X": shared, "Y": Terminal("y", (3, -1))}),
+        },
+    )
+    game = ExtensiveGame(root)
+    assert len(game.nodes()) == 6
+    assert game.backward_induction() == ((2, 0), {"b": "X", "root": "B"})
+
+    with pytest.raises(ValueError):
+        load(POKER).backward_induction()
+
+
+def test_sequence_form():
+    poker = load(POKER)
+    form = poker.sequence_form()
+
+    assert form.sequences[0] == [None, ("high", "Raise"), ("high", "Fold"), ("low", "Raise"), ("low", "Fold")]
+    assert form.sequences[1] == [None, ("raised", "Meet"), ("raised", "Pass")]
+    assert form.constraints[1] == [{0: 1.0}, {0: -1.0, 1: 1.0, 2: 1.0}]
+    assert form.payoffs[0][(1, 1)] == 1.0
+
+    # one card poker (Myerson), bluff with a third of the low cards
+    value, player, opponent = poker.solve_zero_sum()
+    assert value == pytest.approx(1 / 3)
+    assert player["high"]["Raise"] == pytest.approx(1)
+    assert player["low"]["Raise"] == pytest.approx(1 / 3)
+    assert opponent["raised"]["Meet"] == pytest.approx(2 / 3)
+
+
+def test_game_from_config():
+    with pytest.raises(ValueError) as e_info:
+        load("[root]\nplayer = P\nactions = A: missing")
+    assert str(e_info.value) == "Node missing is not defined"
+
+    with pytest.raises(ValueError):
+        load("[root]\nplayer = P\nactions = A: root")
+
+    with pytest.raises(ValueError):
+        load("[root]\nplayer = chance\nactions = A: leaf\n[leaf]\npayoffs = 1, 1")
+
+    with pytest.raises(ValueError) as e_info:
+        load("[root]\nplayer = chance\nactions = A: leaf (0.5), B: leaf (0.4)\n[leaf]\npayoffs = 1, 1")
+    assert str(e_info.value) == "The probabilities of chance node root do not sum up to 1"
+
+
+def test_infoset_actions():
+    game = load(POKER.replace("Meet: lose_2, Pass: win_1", "Meet: lose_2, Call: win_1"))
+    with pytest.raises(ValueError) as e_info:
+        game.sequence_form()
+    assert str(e_info.value) == "The nodes of information set raised offer different actions"
+
+
+def test_solve_zero_sum():
+    with open(os.path.join(TREES, "matching_pennies_sequential.ini")) as file:
+        pennies = load(file.read())
+    assert pennies.is_zero_sum()
+    value, _, _ = pennies.solve_zero_sum()
+    assert value == pytest.approx(0)
+
+    coordination = load(POKER.replace("payoffs = 2, -2", "payoffs = 2, 2"))
+    assert not coordination.is_zero_sum()
+    with pytest.raises(ValueError):
+        coordination.solve_zero_sum()
@@ -1,9 +1,13 @@
+import random
+
 import pytest
+from io import StringIO
 from game import (
     Strategy,
     Player,
     Opponent,
     Game,
+    BestResponse,
     all_entries_equal,
     is_biggest_in_list,
     minimaxi,
@@ -11,7 +15,11 @@ from game import (
     oddments2,
     oddments3,
     transpose_strategy_set,
+    correlated_equilibrium,
+    correlated_equilibrium_constraints,
 )
+from double_oracle import double_oracle
+from helpers import random_payoffs
 
 
 def test_transpose_strategy():
@@ -169,3 +177,340 @@ def test_all_entries_equal():
 
     list = ("a", "a", "b")
     assert all_entries_equal(list) == False
+
+
+def test_best_response():
+    player = Player("P", "(3, 0, 1), (3, 2, 0), (1, 5, 0)")
+    opponent = Opponent("O", "(1, 0, 2), (4, 1, 0), (0, 0, 9)")
+    game = Game(player, opponent)
+    best_response = game.best_response
+
+    assert best_response.best_responses(player, 0) == [0, 1]
+    assert best_response.best_responses(player, 1) == [2]
+    assert best_response.ranking(player, 1) == [2, 1, 0]
+    assert best_response.best_responses(opponent, 2) == [2]
+    # mixed strategy of the opponent
+    assert best_response.best_responses(player, (0.5, 0.5, 0)) == [2]
+    assert best_response.best_responses(player, (1, 0, 0)) == [0, 1]
+
+    with pytest.raises(ValueError):
+        best_response.best_responses(player, (0.5, 0.5))
+
+    # P_S2 is the only best response to O_S1 and hence never dominated
+    assert best_response.unique_best_responses(player) == {0, 2}
+    assert best_response.unique_best_responses(opponent) == {1, 2}
+    for weakly, expected in (
+        (False, player.strictly_dominated_strategy()),
+        (True, player.weakly_dominated_strategy()),
+    ):
+        assert game.dominated_strategies(player, weakly) == expected
+
+    # the index is kept up to date and matches a freshly built one
+    game.remove_strategy(player, player.strategy(2))
+    game.remove_strategy(opponent, opponent.strategy(0))
+    rebuilt = BestResponse(game)
+    for side in game.players:
+        other = game.players[1 - game.players.index(side)]
+        for k in range(other.strategy_set_size()):
+            assert best_response.best_responses(side, k) == rebuilt.best_responses(side, k)
+            assert best_response.ranking(side, k) == rebuilt.ranking(side, k)
+    assert best_response.best_responses(player, 0) == [1]
+
+
+def test_pure_nash_equilibrium():
+    player = Player("P", "(1, 0), (0, 2)")
+    opponent = Opponent("O", "(1, 0), (0, 2)")
+    game = Game(player, opponent)
+
+    assert game.pure_nash_equilibrium() == [
+        (player.strategy(0), opponent.strategy(0)),
+        (player.strategy(1), opponent.strategy(1)),
+    ]
+
+
+def test_write():
+    player = Player("P", "(0, 4, 5), (4, 0, 5), (3, 3, 6)")
+    opponent = Opponent("O", "(4, 0, 5), (0, 4, 5), (3, 3, 6)")
+    game = Game(player, opponent)
+
+    # the streamed grid looks the same as the summary of a small game
+    stream = StringIO()
+    game.write(stream, fmt="grid", chunk_size=2)
+    assert stream.getvalue() == str(game) + "\n"
+    assert stream.getvalue().splitlines()[3] == "| P_S0 | (0.0 | 4.0) | (4.0 | 0.0) | (5.0 | 3.0) |"
+
+    stream = StringIO()
+    game.write(stream, fmt="csv")
+    assert stream.getvalue().splitlines()[:2] == [
+        ",O_S0,O_S1,O_S2",
+        "P_S0,(0.0 | 4.0),(4.0 | 0.0),(5.0 | 3.0)",
+    ]
+
+    stream = StringIO()
+    game.write_best_responses(stream, fmt="html")
+    assert "<tr><th>P_S2</th><td>(False, False)</td><td>(False, False)</td><td>(True, True)</td></tr>" in stream.getvalue()
+
+    stream = StringIO()
+    game.write(stream, fmt="summary", max_rows=2, max_columns=2)
+    lines = stream.getvalue().splitlines()
+    assert lines[1] == "|      |    O_S0     |  ...  |    O_S2     |"
+    assert "| P_S0 | (0.0 | 4.0) |  ...  | (5.0 | 3.0) |" in lines
+    assert "P_S1" not in stream.getvalue()
+    assert lines[-1] == "(3 rows x 3 columns)"
+
+    with pytest.raises(ValueError):
+        game.write(stream, fmt="latex")
+
+
+def test_quantal_response_equilibrium():
+    player = Player("Venus", "(50, 80), (90, 20)")
+    opponent = Opponent("Serena", "(50, 10), (20, 80)")
+    game = Game(player, opponent)
+
+    point = game.quantal_response_equilibrium([20])[0]
+    assert point.player == pytest.approx([0.7, 0.3], abs=1e-3)
+    assert point.opponent == pytest.approx([0.6, 0.4], abs=1e-3)
+
+
+def test_correlated_equilibrium():
+    # chicken, the welfare maximising CE avoids the crash and mixes the other cells
+    player = Player("P", "(0, 7), (2, 6)")
+    opponent = Opponent("O", "(0, 7), (2, 6)")
+    game = Game(player, opponent)
+
+    distribution = game.correlated_equilibrium()
+    assert distribution[0] == pytest.approx([0, 0.25])
+    assert distribution[1] == pytest.approx([0.25, 0.5])
+
+    # rock paper scissors has no pure NE, any CE satisfies the incentive constraints
+    player = Player("P", "(0, -1, 1), (1, 0, -1), (-1, 1, 0)")
+    opponent = Opponent("O", "(0, -1, 1), (1, 0, -1), (-1, 1, 0)")
+    game = Game(player, opponent)
+    player_payoffs, opponent_payoffs = game.payoff_matrices()
+
+    distribution = game.correlated_equilibrium("feasible")
+    x = [q for row in distribution for q in row]
+    assert sum(x) == pytest.approx(1)
+    for row in correlated_equilibrium_constraints(player_payoffs, opponent_payoffs):
+        assert sum(a * x[j] for j, a in row.items()) <= 1e-9
+
+    with pytest.raises(ValueError):
+        game.correlated_equilibrium("nash")
+
+    # a zero-sum game with 12 strategies each, 265 constraints on 144 cells, in which
+    # every CE gives the player the value of the game
+    rng = random.Random(0)
+    matrix = [[rng.randint(-5, 5) for _ in range(12)] for _ in range(12)]
+    result = correlated_equilibrium(matrix, [[-matrix[p][o] for p in range(12)] for o in range(12)])
+    payoff = sum(matrix[p][o] * result.x[p * 12 + o] for p in range(12) for o in range(12))
+    assert payoff == pytest.approx(double_oracle(matrix).value)
+
+
+def test_support_enumeration():
+    player = Player("Venus", "(50, 80), (90, 20)")
+    opponent = Opponent("Serena", "(50, 10), (20, 80)")
+    game = Game(player, opponent)
+
+    equilibrium = game.support_enumeration()
+    assert equilibrium.player == pytest.approx([0.7, 0.3])
+    assert equilibrium.opponent == pytest.approx([0.6, 0.4])
+    assert equilibrium.player_support == (0, 1)
+
+    # a wrong guess does not matter
+    assert game.support_enumeration(((0,), (1,))) == equilibrium
+
+
+def test_score_profiles():
+    player = Player("Venus", "(50, 80), (90, 20)")
+    opponent = Opponent("Serena", "(50, 10), (20, 80)")
+    game = Game(player, opponent)
+
+    equilibrium, pure, oddments = game.score_profiles(
+        [([0.7, 0.3], [0.6, 0.4]), ([1, 0], [1, 0]), ([7, 3], [3, 2])]
+    )
+    assert equilibrium.epsilon == pytest.approx(0)
+    assert game.is_epsilon_equilibrium([0.7, 0.3], [0.6, 0.4])
+
+    # Venus playing S0 against S0 gains 40 by switching, Serena nothing
+    assert pure.player_regret == pytest.approx(40)
+    assert pure.opponent_regret == pytest.approx(0)
+    assert pure.epsilon == pytest.approx(40)
+    assert pure.exploitability == pytest.approx(40)
+
+    # oddments are normalised
+    assert oddments.epsilon == pytest.approx(0)
+
+    # scoring stops at the first good enough profile
+    scores = game.score_profiles(
+        [([1, 0], [1, 0]), ([0.7, 0.3], [0.6, 0.4]), ([0, 1], [0, 1])], stop_at=1e-9
+    )
+    assert len(scores) == 2
+
+    with pytest.raises(ValueError):
+        game.score_profiles([([1, 0, 0], [1, 0])])
+    with pytest.raises(ValueError):
+        game.score_profiles([([-1, 2], [1, 0])])
+
+
+def test_collapse_duplicates():
+    player = Player("P", "(3, 3, 8, 8), (3, 3, 8, 8), (5, 2, 5, 2), (5, 1, 5, 1)")
+    opponent = Opponent("O", "(8, 8, 5, 5), (8, 8, 10, 0), (3, 3, 5, 5), (3, 3, 10, 0)")
+    game = Game(player, opponent)
+    p0, p1, p2, p3 = player.strategy_set
+    o0, o1, o2, o3 = opponent.strategy_set
+
+    duplicates = game.collapse_duplicates()
+    assert player.strategy_set == [p0, p2, p3]
+    assert opponent.strategy_set == [o0, o1, o2, o3]
+    assert o0.payoffs == [8, 5, 5]
+    assert duplicates.classes == {p0: [p1]}
+
+    # expanding gives the equilibria of the original game
+    original = Game(
+        Player("P", "(3, 3, 8, 8), (3, 3, 8, 8), (5, 2, 5, 2), (5, 1, 5, 1)"),
+        Opponent("O", "(8, 8, 5, 5), (8, 8, 10, 0), (3, 3, 5, 5), (3, 3, 10, 0)"),
+    )
+    expanded = duplicates.expand_equilibria(game.pure_nash_equilibrium())
+    assert [(p.name, o.name) for p, o in expanded] == [
+        (p.name, o.name) for p, o in original.pure_nash_equilibrium()
+    ]
+    assert (p1, o1) in expanded
+    assert duplicates.expand_mix(player.strategy_set, [0.5, 0.25, 0.25]) == [0.5, 0, 0.25, 0.25]
+    assert duplicates.expand_mix(opponent.strategy_set, [1, 0, 0, 0]) == [1, 0, 0, 0]
+
+    # the same payoffs for the owner alone are no duplicate
+    game = Game(Player("P", "(1, 2), (1, 2)"), Opponent("O", "(0, 1), (3, 3)"))
+    assert game.collapse_duplicates().classes == {}
+    assert game.player.strategy_set_size() == 2
+
+    # but weak deletion keeps only the first of them
+    p0, p1 = game.player.strategy_set
+    assert game.dominated_strategies(game.player, weakly=True) == [p0, p1]
+    assert game.dominated_strategies(game.player, weakly=True, keep_first=True) == [p1]
+    game.solve_by_iterated_deletion(use_weakly=True)
+    assert [s.name for s in game.player.strategy_set] == ["P_S0"]
+    assert [s.name for s in game.opponent.strategy_set] == ["O_S1"]
+
+
+def test_snapshot():
+    rng = random.Random(7)
+    for _ in range(30):
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        player, opponent = random_payoffs(rng, m, n)
+        for use_weakly in (False, True):
+            game = Game(Player("P", player), Opponent("O", opponent))
+            view = game.snapshot()
+            assert [
+                (game.player.strategy(p).name, game.opponent.strategy(o).name)
+                for p, o in view.pure_nash_equilibria()
+            ] == [(p.name, o.name) for p, o in game.pure_nash_equilibrium()]
+
+            reduced = view.iterated_deletion(use_weakly)
+            game.solve_by_iterated_deletion(use_weakly)
+            assert reduced.names(0) == tuple(s.name for s in game.player.strategy_set)
+            assert reduced.names(1) == tuple(s.name for s in game.opponent.strategy_set)
+            assert reduced.payoff_matrices() == game.payoff_matrices()
+            # the snapshot itself is untouched
+            assert view.remaining(0) == tuple(range(m))
+            assert view.remaining(1) == tuple(range(n))
+
+
+def test_game_view():
+    game = Game(Player("P", "(1, 2), (3, 4)"), Opponent("O", "(5, 6), (7, 8)"))
+    view = game.snapshot()
+    smaller = view.remove(0, 0)
+    assert smaller.names(0) == ("P_S1",)
+    assert smaller.payoff_matrices() == ([[3, 4]], [[6], [8]])
+    assert smaller == view.remove(0, [0]) and smaller != view
+    assert view.remove(1, 1).remove(0, 0).remaining(1) == (0,)
+
+    with pytest.raises(ValueError):
+        smaller.remove(0, 0)
+
+    # of strategies with the same payoffs the first one is kept
+    view = Game(Player("P", "(1, 2), (1, 2)"), Opponent("O", "(0, 1), (3, 3)")).snapshot()
+    assert view.dominated(0, weakly=True) == [0, 1]
+    assert view.dominated(0, weakly=True, keep_first=True) == [1]
+    reduced = view.iterated_deletion(use_weakly=True)
+    assert (reduced.names(0), reduced.names(1)) == (("P_S0",), ("O_S1",))
+
+    # strategies are compact
+    with pytest.raises(AttributeError):
+        game.player.strategy(0).colour = "red"
+
+
+def test_weak_elimination_outcomes():
+    game = Game(Player("P", "(1, 1), (1, 0), (0, 1)"), Opponent("O", "(0, 0, 0), (0, 0, 0)"))
+    outcomes = game.weak_elimination_outcomes()
+    assert [(o.view.names(0), o.view.names(1)) for o in outcomes] == [
+        (("P_S2",), ("O_S1",)),
+        (("P_S0",), ("O_S1",)),
+        (("P_S1",), ("O_S0",)),
+        (("P_S0",), ("O_S0",)),
+    ]
+    # the game itself stays intact
+    assert game.player.strategy_set_size() == 3
+
+    # every order leads to exactly one outcome, so the counts add up to all orders
+    def orders(view):
+        moves = [(side, s) for side in range(2) for s in view.dominated(side, weakly=True)]
+        if not moves:
+            return {view: 1}
+        counts = dict()
+        for side, s in moves:
+            for end, count in orders(view.remove(side, s)).items():
+                counts[end] = counts.get(end, 0) + count
+        return counts
+
+    rng = random.Random(9)
+    for _ in range(20):
+        m, n = rng.randint(1, 4), rng.randint(1, 4)
+        player, opponent = random_payoffs(rng, m, n, high=2)
+        view = Game(Player("P", player), Opponent("O", opponent)).snapshot()
+        outcomes = view.weak_elimination_outcomes(count_orders=True)
+        # the pruned search reaches the same games
+        assert {o.view for o in view.weak_elimination_outcomes()} == {o.view for o in outcomes}
+
+        # interchangeable strategies are replaced by the first ones of their kind
+        player_payoffs, opponent_payoffs = view.payoff_matrices()
+        kinds = [
+            [(tuple(player_payoffs[p]), tuple(row[p] for row in opponent_payoffs)) for p in range(m)],
+            [(tuple(opponent_payoffs[o]), tuple(row[o] for row in player_payoffs)) for o in range(n)],
+        ]
+
+        def first_ones(end):
+            remaining = list()
+            for side in range(2):
+                kind = kinds[side]
+                kept = [kind[s] for s in end.remaining(side)]
+                remaining.append(
+                    [s for s in range(len(kind)) if kept.count(kind[s]) > kind[:s].count(kind[s])]
+                )
+            return view.remove(0, [s for s in range(m) if s not in remaining[0]]).remove(
+                1, [s for s in range(n) if s not in remaining[1]]
+            )
+
+        expected = dict()
+        for end, count in orders(view).items():
+            end = first_ones(end)
+            expected[end] = expected.get(end, 0) + count
+        assert {o.view: o.orders for o in outcomes} == expected
+        for outcome in outcomes:
+            end = view
+            for side, s in outcome.order:
+                assert s in end.dominated(side, weakly=True)
+                end = end.remove(side, s)
+            assert end == outcome.view
+
+    # a dominant strategy over 24 strategies it weakly dominates, against 24 strategies
+    # of which the last one strictly dominates all others
+    k = 24
+    player = ", ".join(
+        "(" + ", ".join("0" if c == p - 1 else "1" for c in range(k)) + ")" for p in range(k + 1)
+    )
+    opponent = ", ".join("(" + ", ".join([str(c)] * (k + 1)) + ")" for c in range(k))
+    game = Game(Player("P", player), Opponent("O", opponent))
+    outcomes = game.weak_elimination_outcomes()
+    assert sorted((o.view.names(0), o.view.names(1)) for o in outcomes) == sorted(
+        ((f"P_S{p}",), (f"O_S{k - 1}",)) for p in range(k)
+    )
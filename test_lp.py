@@ -0,0 +1,55 @@
+import itertools
+import random
+
+import pytest
+import lp
+from lp import linprog
+
+
+def test_linprog():
+    # maximise 3x + 5y subject to x <= 4, 2y <= 12, 3x + 2y <= 18
+    result = linprog([3, 5], [{0: 1}, {1: 2}, [3, 2]], [4, 12, 18])
+
+    assert result.x == pytest.approx([2, 6])
+    assert result.value == pytest.approx(36)
+    assert result.duals == pytest.approx([0, 1.5, 1])
+
+    # a slightly changed objective, warm started from the previous basis
+    warm = linprog([3, 5.5], [{0: 1}, {1: 2}, [3, 2]], [4, 12, 18], basis=result.basis)
+    assert warm.value == pytest.approx(39)
+
+    # minimise x + y subject to x + y >= 2 and x = y
+    result = linprog([-1, -1], [{0: -1, 1: -1}], [-2], [{0: 1, 1: -1}], [0])
+    assert result.x == pytest.approx([1, 1])
+
+
+def test_linprog_refactor(monkeypatch):
+    # an assignment problem, whose optimum is the best permutation, with the factors
+    # of the basis rebuilt every few pivots
+    monkeypatch.setattr(lp, "REFACTOR", 4)
+    rng = random.Random(5)
+    size = 7
+    weights = [[rng.randint(0, 20) for _ in range(size)] for _ in range(size)]
+    rows_eq = [{i * size + j: 1 for j in range(size)} for i in range(size)]
+    rows_eq += [{i * size + j: 1 for i in range(size)} for j in range(size)]
+
+    result = linprog([w for row in weights for w in row], rows_eq=rows_eq, b_eq=[1] * 2 * size)
+    best = max(
+        sum(weights[i][j] for i, j in enumerate(permutation))
+        for permutation in itertools.permutations(range(size))
+    )
+    assert result.value == pytest.approx(best)
+    assert sum(result.x) == pytest.approx(size)
+
+
+def test_linprog_errors():
+    with pytest.raises(ValueError) as e_info:
+        linprog([1], [{0: 1}], [1], [{0: 1}], [2])
+    assert str(e_info.value) == "Linear program is infeasible"
+
+    with pytest.raises(ValueError) as e_info:
+        linprog([1], [{0: -1}], [1])
+    assert str(e_info.value) == "Linear program is unbounded"
+
+    with pytest.raises(ValueError):
+        linprog([1], [{3: 1}], [1])
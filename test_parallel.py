@@ -0,0 +1,35 @@
+import random
+
+import pytest
+from helpers import random_game
+from parallel import DOMINANCE, dominance, pure_nash_equilibria
+
+
+def test_dominance():
+    rng = random.Random(5)
+    for _ in range(20):
+        game = random_game(rng, rng.randint(1, 8), rng.randint(1, 8))
+        for player in game.players:
+            for kind in DOMINANCE:
+                expected = getattr(player, f"{kind}_strategy")()
+                assert dominance(player, kind, workers=1, shard_size=3) == expected
+                assert dominance(player, kind, workers=2, pool="thread", shard_size=3) == expected
+
+    with pytest.raises(ValueError):
+        dominance(game.player, "dominated")
+
+
+def test_pure_nash_equilibria():
+    rng = random.Random(6)
+    games = [random_game(rng, rng.randint(1, 8), rng.randint(1, 8)) for _ in range(20)]
+    for game in games:
+        expected = game.pure_nash_equilibrium()
+        assert pure_nash_equilibria(game, workers=1, shard_size=2) == expected
+        assert pure_nash_equilibria(game, workers=2, pool="thread", shard_size=2) == expected
+
+    # the process pool merges the shards in the same order
+    game = games[-1]
+    assert pure_nash_equilibria(game, workers=2, shard_size=1) == game.pure_nash_equilibrium()
+    assert dominance(game.player, "weakly_dominated", workers=2, shard_size=1) == (
+        game.player.weakly_dominated_strategy()
+    )
@@ -0,0 +1,53 @@
+import configparser
+import os
+import sys
+
+import pytest
+import project
+from project import game_from_config
+
+GAMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games")
+
+
+def load(name: str):
+    config = configparser.ConfigParser()
+    config.read(os.path.join(GAMES, "default.ini"))
+    config.read(os.path.join(GAMES, name))
+    return game_from_config(config)
+
+
+def test_mixed_nash_equilibrium():
+    game = load("tennis.ini")
+    player_mix = game.mixed_nash_equilibrium(game.player)
+    opponent_mix = game.mixed_nash_equilibrium(game.opponent)
+
+    assert player_mix == pytest.approx((0.7, 0.3))
+    assert opponent_mix == pytest.approx((0.6, 0.4))
+    assert game.score_profiles([(player_mix, opponent_mix)])[0].epsilon == pytest.approx(0)
+
+    game = load("tennis_2.ini")
+    assert game.mixed_nash_equilibrium(game.player) == pytest.approx((7 / 12, 5 / 12))
+    assert game.is_epsilon_equilibrium(
+        game.mixed_nash_equilibrium(game.player), game.mixed_nash_equilibrium(game.opponent)
+    )
+
+
+def test_main(monkeypatch, capsys):
+    monkeypatch.chdir(os.path.dirname(GAMES))
+    monkeypatch.setattr(sys, "argv", ["project.py", "-c", "games/sharing.ini", "--use_weakly"])
+    project.main()
+
+    out = capsys.readouterr().out
+    assert "... no further optimization found" in out
+    assert "Looking for mixed NE ..." in out
+
+
+def test_single_strategy_mix(monkeypatch, capsys):
+    monkeypatch.chdir(os.path.dirname(GAMES))
+    monkeypatch.setattr(sys, "argv", ["project.py", "-c", "games/prisoners_dilemma.ini"])
+    project.main()
+
+    out = capsys.readouterr().out
+    assert "has a single strategy left" in out
+    assert "quantal response" not in out
+    assert "epsilon = 0" in out
@@ -0,0 +1,35 @@
+import pytest
+from linalg import solve
+from qre import logit_qre_path
+
+
+def test_solve():
+    assert solve([[2, 1], [1, 3]], [3, 5]) == pytest.approx([0.8, 1.4])
+    # a zero on the diagonal needs pivoting
+    assert solve([[0, 1], [1, 0]], [2, 3]) == pytest.approx([3, 2])
+
+    with pytest.raises(ValueError) as e_info:
+        solve([[1, 2], [2, 4]], [1, 2])
+    assert str(e_info.value) == "Matrix is singular"
+
+
+def test_logit_qre_path():
+    # tennis, lecture 9
+    points = logit_qre_path([[50, 80], [90, 20]], [[50, 10], [20, 80]], [0, 0.1, 10])
+
+    assert [point.lam for point in points] == [0, 0.1, 10]
+    assert points[0].player == pytest.approx([0.5, 0.5])
+    assert points[-1].player == pytest.approx([0.7, 0.3], abs=1e-3)
+    assert points[-1].opponent == pytest.approx([0.6, 0.4], abs=1e-3)
+
+    # rock paper scissors stays uniform for every lambda
+    rps = [[0, -1, 1], [1, 0, -1], [-1, 1, 0]]
+    point = logit_qre_path(rps, rps, [25])[0]
+    assert point.player == pytest.approx([1 / 3] * 3)
+
+    # the prisoners dilemma approaches the pure NE
+    point = logit_qre_path([[10, 1], [25, 3]], [[10, 1], [25, 3]], [50])[0]
+    assert point.player[1] == pytest.approx(1, abs=1e-6)
+
+    with pytest.raises(ValueError):
+        logit_qre_path(rps, rps, [-1])
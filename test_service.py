@@ -0,0 +1,103 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from service import SolverService, analyse, init_worker, read_defaults
+
+
+def test_analyse():
+    init_worker(read_defaults())
+    response = analyse(
+        {
+            "id": 7,
+            "ini": "[payoffs]\nplayer = (10, 1), (25, 3)\nopponent = (10, 1), (25, 3)",
+            "analyses": ["dominance", "pure_nash"],
+        }
+    )
+
+    assert response["id"] == 7
+    assert response["result"]["pure_nash"] == [["P_S1", "O_S1"]]
+    assert response["result"]["dominance"]["P"]["strictly_dominated"] == ["P_S0"]
+
+    response = analyse({"id": 8, "game": {"payoffs": {"player": "(50, 80), (90, 20)",
+                                                     "opponent": "(50, 10), (20, 80)"}}})
+    assert response["result"]["mixed"]["P"] == pytest.approx({"P_S0": 0.7, "P_S1": 0.3})
+
+    response = analyse({"id": 11, "game": {"payoffs": {"player": [[50, 80], [90, 20]],
+                                                      "opponent": [[50, 10], [20, 80]]}}})
+    assert response["result"]["mixed"]["P"] == pytest.approx({"P_S0": 0.7, "P_S1": 0.3})
+    response = analyse({"id": 12, "game": {"payoffs": {"player": [[1, "a"]], "opponent": [[1]]}}})
+    assert response["error"].startswith("payoffs of player need to be")
+
+    assert "error" in analyse({"id": 9})
+    assert "error" in analyse({"id": 10, "ini": "", "analyses": ["unknown"]})
+
+
+def test_service_connection():
+    async def roundtrip():
+        service = SolverService(executor=ThreadPoolExecutor(2), batch_size=4)
+        await service.start()
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        for i in range(10):
+            request = {"id": i, "ini": "", "analyses": ["pure_nash"]}
+            writer.write(json.dumps(request).encode() + b"\n")
+        writer.write(b"not json\n")
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+        return responses
+
+    responses = asyncio.run(roundtrip())
+
+    assert len(responses) == 11
+    results = {r["id"]: r for r in responses if r["id"] is not None}
+    assert sorted(results) == list(range(10))
+    assert all(r["result"]["pure_nash"] == [["P_S0", "O_S1"]] for r in results.values())
+    assert [r for r in responses if r["id"] is None][0]["error"].startswith("invalid request")
+
+
+def test_service_line_limit():
+    async def roundtrip():
+        service = SolverService(executor=ThreadPoolExecutor(1))
+        await service.start()
+        server = await asyncio.start_server(
+            service.handle_connection, "127.0.0.1", 0, limit=64
+        )
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'{"id": 1, "ini": "' + b"x" * 200 + b'"}\n')
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+        return responses
+
+    responses = asyncio.run(roundtrip())
+    assert responses == [{"id": None, "error": "invalid request: line too long"}]
+
+
+def test_service_stop():
+    async def stop_while_queued():
+        # a long batch delay keeps the requests queued until the service stops
+        service = SolverService(executor=ThreadPoolExecutor(1), batch_delay=60)
+        await service.start()
+        requests = [
+            asyncio.create_task(service.submit({"id": i, "ini": ""})) for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        await service.stop()
+        responses = await asyncio.wait_for(asyncio.gather(*requests), 5)
+        return responses + [await service.submit({"id": 3, "ini": ""})]
+
+    responses = asyncio.run(stop_while_queued())
+    assert [r["id"] for r in responses] == [0, 1, 2, 3]
+    assert all(r["error"] == "service stopped" for r in responses)
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+from helpers import random_game
+from sweep import iterated_strict_deletion, sweep
+
+
+def test_iterated_strict_deletion():
+    # prisoners dilemma, both defect
+    payoffs = [[10, 1], [25, 3]]
+    rows, columns, order = iterated_strict_deletion(payoffs, payoffs)
+    assert (rows, columns) == ([1], [1])
+    assert sorted(order) == [(0, 0), (1, 0)]
+
+    # replaying the order gives the same result, a wrong order is detected
+    assert iterated_strict_deletion(payoffs, payoffs, order) == (rows, columns, order)
+    assert iterated_strict_deletion(payoffs, payoffs, [(0, 1)])[:2] == (rows, columns)
+
+    # the same as the deletion on a snapshot
+    rng = random.Random(4)
+    for _ in range(20):
+        view = random_game(rng, rng.randint(1, 6), rng.randint(1, 6)).snapshot()
+        reduced = view.iterated_deletion(use_weakly=False)
+        rows, columns, _ = iterated_strict_deletion(*view.payoff_matrices())
+        assert (tuple(rows), tuple(columns)) == (reduced.remaining(0), reduced.remaining(1))
+
+
+def test_sweep():
+    points = sweep(
+        "(50, {x}), (90, 20)",
+        "(50, 10), (20, 80)",
+        {"x": [10, 30, 50, 70]},
+        names=("Venus", "Serena"),
+    )
+
+    assert [point.parameters for point in points] == [{"x": x} for x in (10, 30, 50, 70)]
+    # at x = 10 the first strategy of Venus is strictly dominated
+    assert points[0].player == ["Venus_S1"]
+    assert points[0].changed == False
+    assert points[1].changed == True
+    assert points[1].equilibrium.player == pytest.approx([0.7, 0.3])
+    assert [point.changed for point in points[2:]] == [False, False]
+
+
+def test_sweep_callable():
+    points = sweep(
+        lambda a: f"({a}, 0), (0, 1)",
+        lambda a: "(1, 0), (0, 1)",
+        {"a": [1, 2]},
+        correlated=True,
+    )
+
+    assert points[0].equilibrium.player_support == (0,)
+    assert points[1].correlated.value == pytest.approx(3)
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+from game import Game, Opponent, Player
+from tournament import (
+    MemoryStrategy,
+    always,
+    play,
+    play_noisy,
+    random_strategy,
+    round_robin,
+    tit_for_tat,
+    win_stay_lose_shift,
+)
+
+
+def prisoners_dilemma() -> Game:
+    return Game(Player("P", "(-2, -10), (0, -5)"), Opponent("O", "(-2, -10), (0, -5)"))
+
+
+def test_memory_strategy():
+    assert tit_for_tat().table == (0, 1, 0, 1)
+    assert win_stay_lose_shift().table == (0, 1, 1, 0)
+
+    with pytest.raises(ValueError):
+        MemoryStrategy("short", 1, (0, 1, 0))
+    with pytest.raises(ValueError):
+        MemoryStrategy("unknown", 1, (0, 1, 2, 0))
+
+
+def test_play():
+    player_payoffs, opponent_payoffs = prisoners_dilemma().payoff_matrices()
+
+    # tit for tat is exploited once, then both defect
+    assert play(player_payoffs, opponent_payoffs, tit_for_tat(), always(1), 10) == (-55, -45)
+
+    # the extrapolated cycles match playing every round
+    rng = random.Random(0)
+    strategies = [random_strategy(memory, rng) for memory in (1, 2, 3) for _ in range(5)]
+    for first in strategies:
+        for second in strategies:
+            assert play(player_payoffs, opponent_payoffs, first, second, 101) == play_noisy(
+                player_payoffs, opponent_payoffs, first, second, 101, 0.0, rng
+            )
+
+
+def test_round_robin():
+    game = prisoners_dilemma()
+    strategies = [tit_for_tat(), always(0), always(1)]
+
+    result = round_robin(game, strategies, rounds=100)
+    assert result.names == ["tit_for_tat", "always_0", "always_1"]
+    assert result.scores[0][1] == -2
+    assert result.scores[2][1] == 0
+    assert [name for name, _ in result.ranking] == ["tit_for_tat", "always_1", "always_0"]
+
+    # noise is reproducible by the seed, independent of the processes
+    noisy = round_robin(game, strategies, rounds=100, noise=0.1, seed=3, workers=1, shard_size=1)
+    assert noisy == round_robin(game, strategies, rounds=100, noise=0.1, seed=3, workers=2)
+    assert noisy != round_robin(game, strategies, rounds=100, noise=0.1, seed=4, workers=1)
+
+    # in an asymmetric game both orders of the strategies give the same ranking
+    battle_of_the_sexes = Game(Player("P", "(2, 0), (0, 1)"), Opponent("O", "(1, 0), (0, 2)"))
+    strategies = [always(0), always(1), tit_for_tat()]
+    forward = round_robin(battle_of_the_sexes, strategies, rounds=100)
+    backward = round_robin(battle_of_the_sexes, strategies[::-1], rounds=100)
+    assert forward.ranking == backward.ranking
+    assert forward.scores[0][1] == backward.scores[2][1]
+
+    with pytest.raises(ValueError):
+        round_robin(Game(Player("P", "(1, 2, 3)"), Opponent("O", "(1), (2), (3)")), strategies)
@@ -0,0 +1,356 @@
+"""
+Round robin tournaments of repeated games, in the style of Axelrod.
+
+A strategy with memory n chooses its next action by looking up the last n rounds,
+its own and the other ones action, in a table. Without noise a match is
+deterministic and the pair of states of both strategies has to repeat after a
+few rounds, so only the rounds up to the first repetition are played and the
+cycle is then extrapolated to the length of the match. With noise every round
+is played, with a random number generator seeded per match so the results can
+be reproduced independent of how the matches are spread over processes.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from game import Game
+
+
+class MemoryStrategy:
+    """
+    a strategy of a repeated game, given as lookup table over the last rounds
+
+    The state is the sequence of the last memory rounds, oldest first, where each
+    round is the pair (own action, other action). The state is encoded as number
+    in base actions * actions, and table[state] holds the action to play.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory: int,
+        table: Sequence[int],
+        actions: int = 2,
+        initial: Optional[Sequence[tuple[int, int]]] = None,
+    ):
+        """
+        :param initial: the rounds assumed to be played before the match, by default
+            both played the first action
+        """
+        if memory < 1:
+            raise ValueError("Memory must be at least 1")
+        if len(table) != (actions * actions) ** memory:
+            raise ValueError(f"Table must have {(actions * actions) ** memory} entries")
+        if any(action < 0 or action >= actions for action in table):
+            raise ValueError("Table holds an unknown action")
+        if initial is None:
+            initial = [(0, 0)] * memory
+        if len(initial) != memory:
+            raise ValueError("Initial history must cover the memory")
+
+        self.name = name
+        self.memory = memory
+        self.actions = actions
+        self.table = tuple(table)
+        self.initial_state = encode(initial, actions)
+
+        # the next state for every state and round, where the round is encoded as
+        # own action * actions + other action
+        joint = actions * actions
+        states = joint**memory
+        self.transitions = [
+            [(state * joint + move) % states for move in range(joint)]
+            for state in range(states)
+        ]
+
+    def __str__(self):
+        return self.name
+
+    __repr__ = __str__
+
+    @classmethod
+    def from_rule(
+        cls,
+        name: str,
+        memory: int,
+        rule: Callable[[tuple[tuple[int, int], ...]], int],
+        actions: int = 2,
+        initial: Optional[Sequence[tuple[int, int]]] = None,
+    ) -> "MemoryStrategy":
+        """
+        builds the table by asking the rule for the action after every possible history
+        """
+        rounds = list(product(range(actions), repeat=2))
+        table = [rule(history) for history in product(rounds, repeat=memory)]
+        return cls(name, memory, table, actions, initial)
+
+
+def encode(history: Sequence[tuple[int, int]], actions: int) -> int:
+    state = 0
+    for own, other in history:
+        state = state * actions * actions + own * actions + other
+    return state
+
+
+def always(action: int, actions: int = 2, name: Optional[str] = None) -> MemoryStrategy:
+    return MemoryStrategy.from_rule(name or f"always_{action}", 1, lambda h: action, actions)
+
+
+def tit_for_tat() -> MemoryStrategy:
+    """
+    cooperates (action 0) first, then repeats the last action of the other
+    """
+    return MemoryStrategy.from_rule("tit_for_tat", 1, lambda h: h[-1][1])
+
+
+def win_stay_lose_shift() -> MemoryStrategy:
+    """
+    keeps its action after the other cooperated (action 0), otherwise switches
+    """
+    return MemoryStrategy.from_rule(
+        "win_stay_lose_shift", 1, lambda h: h[-1][0] if h[-1][1] == 0 else 1 - h[-1][0]
+    )
+
+
+def tit_for_two_tats() -> MemoryStrategy:
+    return MemoryStrategy.from_rule(
+        "tit_for_two_tats", 2, lambda h: 1 if h[0][1] == 1 and h[1][1] == 1 else 0
+    )
+
+
+def random_strategy(
+    memory: int, rng: random.Random, actions: int = 2, name: Optional[str] = None
+) -> MemoryStrategy:
+    size = (actions * actions) ** memory
+    table = [rng.randrange(actions) for _ in range(size)]
+    return MemoryStrategy(name or f"memory_{memory}_{rng.getrandbits(32):08x}", memory, table, actions)
+
+
+class TournamentResult(NamedTuple):
+    """
+    scores[i][j] is the average payoff per round of strategy i against strategy j,
+    ranking lists the names with their average score, best first
+    """
+
+    names: list[str]
+    scores: list[list[float]]
+    ranking: list[tuple[str, float]]
+
+
+def round_robin(
+    game: Game,
+    strategies: list[MemoryStrategy],
+    rounds: int = 200,
+    noise: float = 0.0,
+    seed: int = 0,
+    repetitions: int = 1,
+    self_play: bool = True,
+    workers: Optional[int] = 1,
+    shard_size: int = 256,
+) -> TournamentResult:
+    """
+    plays every pair of strategies against each other. In a symmetric game, where
+    the payoffs do not depend on who takes the part of the player, a single match
+    per pair is played. Otherwise every pair plays a match in both parts, and the
+    scores are averaged over both, so the result does not depend on the order of
+    the strategies.
+
+    :param game: the stage game, both players need the same number of strategies
+    :param noise: the probability that an action is replaced by another one at random
+    :param seed: the seed of the random number generators of the matches
+    :param repetitions: the number of matches per pair, only useful with noise
+    :param workers: the number of processes the matches are spread over, 1 plays them
+        in this process and None uses one per CPU
+    :param shard_size: the number of matches handed to a process at once
+    """
+    player_payoffs, opponent_payoffs = game.payoff_matrices()
+    actions = len(player_payoffs)
+    if len(opponent_payoffs) != actions:
+        raise ValueError("Both players need the same number of strategies")
+    for strategy in strategies:
+        if strategy.actions != actions:
+            raise ValueError(f"{strategy} does not match the strategies of the game")
+    if not 0 <= noise <= 1:
+        raise ValueError("Noise must be a probability")
+
+    # symmetric if the opponent gets what the player would get in its place
+    both_roles = player_payoffs != opponent_payoffs
+
+    size = len(strategies)
+    pairs = [
+        (i, j)
+        for i in range(size)
+        for j in range(i if self_play else i + 1, size)
+    ]
+    shards = [pairs[k : k + shard_size] for k in range(0, len(pairs), shard_size)]
+    jobs = [
+        (
+            player_payoffs,
+            opponent_payoffs,
+            strategies,
+            shard,
+            rounds,
+            noise,
+            seed,
+            repetitions,
+            both_roles,
+        )
+        for shard in shards
+    ]
+
+    if workers == 1:
+        results = map(_play_shard, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_play_shard, jobs)
+
+    try:
+        scores = [[0.0] * size for _ in range(size)]
+        for shard_result in results:
+            for (i, j), (score_i, score_j) in shard_result:
+                if i == j:
+                    scores[i][i] = (score_i + score_j) / 2
+                else:
+                    scores[i][j] = score_i
+                    scores[j][i] = score_j
+    finally:
+        if workers != 1:
+            executor.shutdown()
+
+    names = [strategy.name for strategy in strategies]
+    opponents = size if self_play else size - 1
+    averages = [sum(row) / opponents if opponents > 0 else 0.0 for row in scores]
+    ranking = sorted(zip(names, averages), key=lambda entry: -entry[1])
+    return TournamentResult(names, scores, ranking)
+
+
+def _play_shard(job) -> list[tuple[tuple[int, int], tuple[float, float]]]:
+    (
+        player_payoffs,
+        opponent_payoffs,
+        strategies,
+        shard,
+        rounds,
+        noise,
+        seed,
+        repetitions,
+        both_roles,
+    ) = job
+    results = list()
+    for i, j in shard:
+        total_i = 0.0
+        total_j = 0.0
+        # i against itself is the same match in either part
+        matches = [(i, j), (j, i)] if both_roles and i != j else [(i, j)]
+        for first, second in matches:
+            for repetition in range(repetitions):
+                if noise > 0:
+                    rng = random.Random(f"{seed}-{first}-{second}-{repetition}")
+                    score_first, score_second = play_noisy(
+                        player_payoffs,
+                        opponent_payoffs,
+                        strategies[first],
+                        strategies[second],
+                        rounds,
+                        noise,
+                        rng,
+                    )
+                else:
+                    score_first, score_second = play(
+                        player_payoffs, opponent_payoffs, strategies[first], strategies[second], rounds
+                    )
+                if first == i:
+                    total_i += score_first
+                    total_j += score_second
+                else:
+                    total_i += score_second
+                    total_j += score_first
+        played = len(matches) * repetitions * rounds
+        results.append(((i, j), (total_i / played, total_j / played)))
+    return results
+
+
+def play(
+    player_payoffs: list[list[float]],
+    opponent_payoffs: list[list[float]],
+    first: MemoryStrategy,
+    second: MemoryStrategy,
+    rounds: int,
+) -> tuple[float, float]:
+    """
+    plays a match without noise, returns the total payoffs of both strategies
+
+    Only the rounds up to the first repetition of the pair of states are played,
+    the cycle found is then repeated to the length of the match.
+    """
+    actions = first.actions
+    next_first = first.transitions
+    next_second = second.transitions
+    state = (first.initial_state, second.initial_state)
+
+    seen: dict[tuple[int, int], int] = {}
+    totals_first = [0.0]
+    totals_second = [0.0]
+    for r in range(rounds):
+        if state in seen:
+            start = seen[state]
+            length = r - start
+            cycle_first = totals_first[r] - totals_first[start]
+            cycle_second = totals_second[r] - totals_second[start]
+            cycles, remainder = divmod(rounds - r, length)
+            return (
+                totals_first[r]
+                + cycles * cycle_first
+                + totals_first[start + remainder]
+                - totals_first[start],
+                totals_second[r]
+                + cycles * cycle_second
+                + totals_second[start + remainder]
+                - totals_second[start],
+            )
+        seen[state] = r
+
+        a = first.table[state[0]]
+        b = second.table[state[1]]
+        totals_first.append(totals_first[-1] + player_payoffs[a][b])
+        totals_second.append(totals_second[-1] + opponent_payoffs[b][a])
+        state = (next_first[state[0]][a * actions + b], next_second[state[1]][b * actions + a])
+
+    return totals_first[-1], totals_second[-1]
+
+
+def play_noisy(
+    player_payoffs: list[list[float]],
+    opponent_payoffs: list[list[float]],
+    first: MemoryStrategy,
+    second: MemoryStrategy,
+    rounds: int,
+    noise: float,
+    rng: random.Random,
+) -> tuple[float, float]:
+    """
+    plays a match where every action is replaced by another one with probability noise
+    """
+    actions = first.actions
+    next_first = first.transitions
+    next_second = second.transitions
+    state_first = first.initial_state
+    state_second = second.initial_state
+    total_first = 0.0
+    total_second = 0.0
+
+    for _ in range(rounds):
+        a = first.table[state_first]
+        b = second.table[state_second]
+        if rng.random() < noise:
+            a = (a + rng.randrange(1, actions)) % actions
+        if rng.random() < noise:
+            b = (b + rng.randrange(1, actions)) % actions
+        total_first += player_payoffs[a][b]
+        total_second += opponent_payoffs[b][a]
+        state_first = next_first[state_first][a * actions + b]
+        state_second = next_second[state_second][b * actions + a]
+
+    return total_first, total_second